@@ -2,17 +2,32 @@
 
 import subprocess
 import os
+import sys
+import shutil
+import re
 import time
 import json
-from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import hashlib
+from functools import lru_cache
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional, Literal, List
+from dataclasses import dataclass, field
+from typing import Optional, Literal, Union
 from datetime import datetime
 from .project_config import ProjectConfig
-from .toolchains import ToolchainConfig, get_toolchains, select_toolchain
+from .toolchains import ToolchainConfig, select_toolchain
+from .depgraph import (
+    build_graph, affected_sources, load_graph_cache, save_graph_cache, read_source_bytes
+)
+
+try:
+    import orjson  # Optional: faster encoding of profile records
+except ImportError:
+    orjson = None
+
+# Feature detection runs on raw bytes, no decoding needed
+_GRAPHICS_RE = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*[<"]graphics\.h[>"]', re.MULTILINE)
+_OMP_RE = re.compile(rb'^[ \t]*#[ \t]*pragma[ \t]+omp\b', re.MULTILINE)
 
 @dataclass
 class BuildResult:
@@ -23,98 +38,8 @@ class BuildResult:
     exe_path: Optional[Path]
     elapsed_ms: float = 0.0
     skipped: bool = False
-
-class DependencyCache:
-    """Cache for incremental builds with header dependency tracking."""
-
-    def __init__(self, cache_file: Path):
-        self.cache_file = cache_file
-        self.file_hashes: dict[Path, str] = {}  # file -> hash
-        self.dependencies: dict[Path, set[Path]] = defaultdict(set)  # file -> set of headers
-        self._load()
-    
-    def _hash_file(self, path: Path) -> str:
-        """Fast file hashing using blake2b from stdlib."""
-        try:
-            with open(path, 'rb') as f:
-                return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
-        except (FileNotFoundError, PermissionError):
-            return ""
-    
-    def _check_hash(self, path: Path) -> bool:
-        """Check if file hash matches cached hash."""
-        if not path.exists():
-            return False
-        
-        current_hash = self._hash_file(path)
-        cached_hash = self.file_hashes.get(path)
-        
-        if cached_hash != current_hash:
-            self.file_hashes[path] = current_hash
-            return False
-        return True
-    
-    def _load(self):
-        """Load cache from disk."""
-        if not self.cache_file.exists():
-            return
-        
-        try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.file_hashes = {Path(k): v for k, v in data.get('hashes', {}).items()}
-                self.dependencies = {
-                    Path(k): {Path(p) for p in v} 
-                    for k, v in data.get('deps', {}).items()
-                }
-        except Exception:
-            pass  # Ignore errors, start fresh
-    
-    def save(self):
-        """Save cache to disk."""
-        try:
-            data = {
-                'hashes': {str(k): v for k, v in self.file_hashes.items()},
-                'deps': {str(k): [str(p) for p in v] for k, v in self.dependencies.items()}
-            }
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f)
-        except Exception:
-            pass  # Silently fail
-    
-    def needs_rebuild(self, source: Path) -> bool:
-        """Check if file or any of its dependencies changed.
-        
-        Uses BFS through dependency graph (DAG).
-        Reduces rebuild checks from O(all files) to O(changed files).
-        """
-        if not self._check_hash(source):
-            return True
-        
-        # BFS through dependency graph
-        visited = set()
-        queue = [source]
-
-        while queue:
-            current = queue.pop(0)
-            if current in visited:
-                continue
-            visited.add(current)
-
-            if not self._check_hash(current):
-                return True
-            queue.extend(self.dependencies[current] - visited)
-        
-        return False
-    
-    def update_file(self, path: Path):
-        """Update hash for a file."""
-        self.file_hashes[path] = self._hash_file(path)
-    
-    def add_dependency(self, source: Path, header: Path):
-        """Add a dependency edge in the graph."""
-        self.dependencies[source].add(header)
-
+    # Per translation unit compile times (source -> ms), parallel builds only
+    unit_elapsed_ms: dict[str, float] = field(default_factory=dict)
 
 class FileExistenceCache:
     """Bloom filter for fast file existence checks.
@@ -179,6 +104,201 @@ class FileExistenceCache:
         return result
 
 
+# File lists at least this long are stat'ed/hashed on a thread pool
+_PARALLEL_IO_MIN = 64
+# Coarsest mtime granularity we guard against (FAT); see BuildState
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _map_files(func, paths: list[Path]) -> list:
+    """Apply func to every path, fanning out to threads for long lists.
+    
+    stat() and hashlib both release the GIL, so the per-file syscalls and
+    digests overlap instead of running back to back.
+    """
+    if len(paths) < _PARALLEL_IO_MIN:
+        return [func(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        return list(executor.map(func, paths))
+
+
+class BuildState:
+    """Per-target record of the sources an executable was built from.
+    
+    Stored in <state_dir>/build_state.json (see state_dir()). Staleness is checked in two
+    tiers: matching (mtime_ns, size) means unchanged without reading the
+    file; otherwise a BLAKE2b-128 content hash decides, so a file that was
+    touched or re-saved with identical content doesn't trigger a rebuild.
+    A "builder key" (hash of the compile command: toolchain path + flags)
+    invalidates the whole record when the toolchain or options change.
+    
+    A matching stat is only trusted for files last modified well before the
+    record was verified. A same-size edit landing in the same timestamp tick
+    as the snapshot would otherwise keep its old mtime, so such "racy"
+    entries are re-hashed until a later check confirms them.
+    """
+    
+    def __init__(self, state_dir: Path, target: str):
+        self.state_file = state_dir / "build_state.json"
+        self.target = target
+        self.builder_key = ""
+        self.files: dict[str, dict] = {}  # source path -> {mtime_ns, size, blake2b}
+        self.verified_ns = 0  # Wall-clock time the entries were last known to be accurate
+        self._snapshot_ns = 0
+        self._load()
+    
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """BLAKE2b-128 of the file contents, read via mmap for larger files."""
+        with read_source_bytes(path) as data:
+            return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    @classmethod
+    def _hash_or_none(cls, path: Path) -> Optional[str]:
+        try:
+            return cls.hash_file(path)
+        except OSError:
+            return None
+    
+    @staticmethod
+    def builder_key_for(cmd: list[str]) -> str:
+        """Hash a compile command so any toolchain or flag change is detected."""
+        return hashlib.blake2b("\0".join(cmd).encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _read_all(self) -> dict:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}  # Missing or corrupt state: start fresh
+    
+    def _load(self):
+        """Load this target's entry from disk."""
+        entry = self._read_all().get(self.target, {})
+        self.builder_key = entry.get('builder_key', "")
+        self.files = entry.get('files', {})
+        self.verified_ns = entry.get('verified_ns', 0)
+    
+    def save(self):
+        """Persist this target's entry atomically (write temp file, then os.replace)."""
+        try:
+            data = self._read_all()
+            data[self.target] = {
+                'builder_key': self.builder_key,
+                'files': self.files,
+                'verified_ns': self.verified_ns
+            }
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix('.json.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.state_file)
+        except Exception:
+            pass  # Silently fail, the next build just won't be skipped
+    
+    def dirty_files(self, builder_key: str, paths: list[Path]) -> set[Path]:
+        """Return the paths whose contents differ from the recorded state.
+        
+        Every path is dirty when the builder key changed.
+        """
+        if not self.builder_key or builder_key != self.builder_key:
+            return set(paths)
+        
+        # Stat everything up front, compare in one pass, then hash only the
+        # files whose mtime moved (or is too recent to trust) at the same size
+        scan_ns = time.time_ns()
+        racy_after = self.verified_ns - _RACY_WINDOW_NS
+        dirty = set()
+        candidates = []
+        for path, st in zip(paths, _map_files(_stat_or_none, paths)):
+            entry = self.files.get(str(path))
+            if entry is None or st is None or st.st_size != entry['size']:
+                dirty.add(path)
+            elif st.st_mtime_ns != entry['mtime_ns'] or st.st_mtime_ns >= racy_after:
+                candidates.append((path, st, entry))
+        
+        touched = False
+        digests = _map_files(self._hash_or_none, [path for path, _, _ in candidates])
+        for (path, st, entry), digest in zip(candidates, digests):
+            if digest != entry['blake2b']:
+                dirty.add(path)
+                continue
+            # Touched but identical: remember the new mtime to keep the fast path
+            entry['mtime_ns'] = st.st_mtime_ns
+            touched = True
+        
+        if candidates and not dirty:
+            # Every entry was confirmed as of scan_ns, so racy ones can use
+            # the stat fast path from now on
+            self.verified_ns = scan_ns
+            touched = True
+        if touched:
+            self.save()
+        return dirty
+    
+    def is_up_to_date(self, builder_key: str, paths: list[Path]) -> bool:
+        """Check whether the same set of files is recorded and none of them changed."""
+        if {str(p) for p in paths} != self.files.keys():
+            return False
+        return not self.dirty_files(builder_key, paths)
+    
+    def snapshot(self, sources: list[Path]) -> dict[str, dict]:
+        """Stat and hash sources; taken before compiling so edits made during
+        the build are picked up by the next one."""
+        self._snapshot_ns = time.time_ns()
+        stats = _map_files(_stat_or_none, sources)
+        present = [(src, st) for src, st in zip(sources, stats) if st is not None]
+        digests = _map_files(self._hash_or_none, [src for src, _ in present])
+        files = {}
+        for (source, st), digest in zip(present, digests):
+            if digest is None:
+                continue  # Missing source: the compiler will report it
+            files[str(source)] = {
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+                'blake2b': digest
+            }
+        return files
+    
+    def record(self, builder_key: str, files: dict[str, dict]):
+        """Store a successful build's snapshot."""
+        self.builder_key = builder_key
+        self.files = files
+        self.verified_ns = self._snapshot_ns
+        self.save()
+
+
+def state_dir(config: ProjectConfig) -> Path:
+    """Directory holding a target's incremental-build state (build record, include graph).
+
+    Projects keep it in <root>/.cpplab. A standalone file's root is just the
+    folder it happens to sit in, so its state goes under the app's own
+    ~/.cpplab instead, one directory per source folder.
+    """
+    if not config.standalone:
+        return config.root_path / ".cpplab"
+    folder = os.path.normcase(os.path.abspath(config.root_path))
+    key = hashlib.blake2b(folder.encode("utf-8"), digest_size=8).hexdigest()
+    return Path.home() / ".cpplab" / "standalone" / key
+
+
+def _include_graph(config: ProjectConfig, sources: list[Path]) -> dict[Path, set[Path]]:
+    """Include graph of the project's sources, re-scanning only files that changed."""
+    cache = load_graph_cache(state_dir(config))
+    previous = dict(cache)
+    graph = build_graph(sources, cache=cache)
+    if cache != previous:
+        save_graph_cache(state_dir(config), cache)
+    return graph
+
+
 def get_executable_path(config: ProjectConfig) -> Path:
     # For standalone files (single file with just a filename, no path), 
     # putting exe in same directoory to reduce confusion and save space
@@ -205,8 +325,14 @@ def maybe_log_profile(config: ProjectConfig, result: BuildResult, toolchain: Too
     
     profile_path = config.root_path / "build_profile.jsonl"
     try:
-        with open(profile_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(profile_data) + "\n")
+        if orjson is not None:
+            line = orjson.dumps(profile_data) + b"\n"
+        else:
+            line = (json.dumps(profile_data, separators=(",", ":")) + "\n").encode("utf-8")
+        # One unbuffered append per entry; no handle is held open between
+        # builds, so the project folder can still be renamed or deleted
+        with open(profile_path, "ab", buffering=0) as f:
+            f.write(line)
     except Exception:
         pass  # Silently fail if logging fails
 
@@ -254,18 +380,67 @@ def check_command(config: ProjectConfig, toolchain: ToolchainConfig) -> list[str
     return cmd
 
 
+def _feature_flags(config: ProjectConfig, toolchain: ToolchainConfig) -> list[str]:
+    """OpenMP and graphics flags shared by the link step and the builder key."""
+    flags = []
+    if config.features.get("openmp", False) and toolchain.supports_openmp:
+        flags.append("-fopenmp")
+    if config.features.get("graphics", False):
+        flags.extend(["-lbgi", "-lgdi32", "-lcomdlg32", "-luuid", "-lole32", "-loleaut32"])
+    return flags
+
+
+# Compiler runs from the GUI shouldn't flash a console window on Windows
+_NO_WINDOW = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+
+def _run(cmd: list[str], cwd: Path, env: dict) -> subprocess.CompletedProcess:
+    """Run a compiler command and capture its output.
+    
+    communicate() drains stdout and stderr concurrently, so a flood of
+    diagnostics can't fill one pipe and stall the compiler.
+    """
+    with subprocess.Popen(
+        cmd,
+        cwd=str(cwd),
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace',
+        creationflags=_NO_WINDOW
+    ) as process:
+        stdout, stderr = process.communicate()
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+def _object_path(obj_dir: Path, source_file: Path) -> Path:
+    """Object file for a project source, mirroring its relative path under obj_dir.
+
+    Keeps a/util.cpp and b/util.cpp from both writing obj/util.o.
+    """
+    rel = Path(source_file)
+    if rel.is_absolute():
+        rel = rel.relative_to(rel.anchor)
+    # Keep "../shared.cpp" inside obj_dir
+    rel = Path(*("__" if part == ".." else part for part in rel.parts))
+    return obj_dir / rel.with_suffix(".o")
+
+
 def _compile_single_source(
     source_file: Path,
     config: ProjectConfig,
     toolchain: ToolchainConfig,
     obj_dir: Path
-) -> tuple[bool, str, str, Path]:
+) -> tuple[bool, str, str, Path, float]:
     """Compile a single source file to object file.
-    Returns: (success, stdout, stderr, obj_path)
+    Returns: (success, stdout, stderr, obj_path, elapsed_ms)
     """
     compiler = "gcc" if config.language == "c" else "g++"
     compiler_path = str(toolchain.bin_dir / f"{compiler}.exe")
-    obj_file = obj_dir / f"{source_file.stem}.o"
+    obj_file = _object_path(obj_dir, source_file)
+    obj_file.parent.mkdir(parents=True, exist_ok=True)
     
     cmd = [
         compiler_path,
@@ -281,17 +456,36 @@ def _compile_single_source(
     env = os.environ.copy()
     env["PATH"] = str(toolchain.bin_dir) + os.pathsep + env.get("PATH", "")
     
+    t0 = time.perf_counter()
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=str(config.root_path),
-            capture_output=True,
-            text=True,
-            env=env
-        )
-        return (result.returncode == 0, result.stdout, result.stderr, obj_file)
+        result = _run(cmd, config.root_path, env)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        return (result.returncode == 0, result.stdout, result.stderr, obj_file, elapsed_ms)
     except Exception as e:
-        return (False, "", str(e), obj_file)
+        return (False, "", str(e), obj_file, (time.perf_counter() - t0) * 1000.0)
+
+
+def _discard_objects(obj_paths: list[Path]) -> None:
+    """Delete objects written by a build that never reached its record step.
+
+    They may have been compiled from sources the build record doesn't
+    describe; with them gone those units are recompiled next time instead of
+    being linked stale behind an "up to date" check.
+    """
+    for obj_path in obj_paths:
+        try:
+            obj_path.unlink()
+        except OSError:
+            pass  # Already gone (the compiler removes its output on error)
+
+
+def _build_jobs() -> int:
+    """Number of parallel compile jobs: CPPLAB_BUILD_JOBS, else one per core."""
+    try:
+        jobs = int(os.getenv("CPPLAB_BUILD_JOBS", ""))
+    except ValueError:
+        jobs = 0
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
 
 def build_project_parallel(
     config: ProjectConfig,
@@ -301,12 +495,14 @@ def build_project_parallel(
 ) -> BuildResult:
     """Build project with parallel compilation for multi-file projects.
     
-    Falls back to sequential build for single-file projects or when
-    only 1-2 files need compilation.
+    Each dirty translation unit is compiled to its own object file on a
+    worker thread (the compiler runs as a child process, so the GIL is not
+    held), then everything is linked in one sequential step.
+    Falls back to a single compiler invocation for 1-2 file projects.
     """
     # Use sequential build for single file
     if len(config.files) <= 2:
-        return build_project(config, toolchains, force_rebuild)
+        return _build_project_serial(config, toolchains, force_rebuild)
     
     toolchain = select_toolchain(config, toolchains)
     exe_path = get_executable_path(config)
@@ -316,16 +512,32 @@ def build_project_parallel(
     obj_dir = build_dir / "obj"
     obj_dir.mkdir(parents=True, exist_ok=True)
     
-    # Check if rebuild needed
-    if not force_rebuild and exe_path.exists():
-        exe_mtime = exe_path.stat().st_mtime
-        needs_recompile = any(
-            (config.root_path / f).stat().st_mtime > exe_mtime
-            for f in config.files
-            if (config.root_path / f).exists()
-        )
-        if not needs_recompile:
-            return BuildResult(
+    # Work out which translation units need recompiling: a source is dirty if
+    # it, or any header it reaches through #include "...", changed since the
+    # last successful build. Everything else reuses its object file.
+    compiler = "gcc" if config.language == "c" else "g++"
+    compiler_path = str(toolchain.bin_dir / f"{compiler}.exe")
+    sources = [config.root_path / f for f in config.files]
+    graph = _include_graph(config, sources)
+    tracked = list(graph)
+    build_state = BuildState(state_dir(config), config.name)
+    builder_key = BuildState.builder_key_for(
+        [compiler_path, f"-std={config.standard}"] + _feature_flags(config, toolchain)
+    )
+    obj_files = {f: _object_path(obj_dir, f) for f in config.files}
+    
+    if force_rebuild:
+        to_compile = list(config.files)
+    else:
+        dirty = build_state.dirty_files(builder_key, tracked)
+        affected = affected_sources(graph, sources, dirty)
+        to_compile = [
+            f for f, src in zip(config.files, sources)
+            if src in affected or not obj_files[f].exists()
+        ]
+        same_files = build_state.files.keys() == {str(p) for p in tracked}
+        if not to_compile and same_files and exe_path.exists():
+            result = BuildResult(
                 success=True,
                 command=[],
                 stdout="Build skipped: executable is up to date.",
@@ -334,25 +546,29 @@ def build_project_parallel(
                 elapsed_ms=0.0,
                 skipped=True
             )
-
+            maybe_log_profile(config, result, toolchain)
+            return result
+    
+    snapshot = build_state.snapshot(tracked)
     t0 = time.perf_counter()
     # Compile sources in parallel
     if max_workers is None:
-        max_workers = min(4, os.cpu_count() or 1)  # Limit to 4 to avoid overwhelming system
+        max_workers = _build_jobs()
     all_stdout = []
     all_stderr = []
-    object_files = []
+    unit_elapsed_ms = {}
     compile_success = True
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
             executor.submit(_compile_single_source, f, config, toolchain, obj_dir): f
-            for f in config.files
+            for f in to_compile
         }
         for future in as_completed(futures):
             source = futures[future]
             try:
-                success, stdout, stderr, obj_file = future.result()
+                success, stdout, stderr, obj_file, unit_ms = future.result()
+                unit_elapsed_ms[str(source)] = unit_ms
                 if stdout:
                     all_stdout.append(stdout)
                 if stderr:
@@ -361,51 +577,46 @@ def build_project_parallel(
                 if not success:
                     compile_success = False
                     break  # Stop on first error
-                
-                object_files.append(obj_file)
             except Exception as e:
                 all_stderr.append(f"Error compiling {source}: {e}")
                 compile_success = False
                 break
 
     if not compile_success:
+        _discard_objects([obj_files[f] for f in to_compile])
         t1 = time.perf_counter()
-        return BuildResult(
+        error_result = BuildResult(
             success=False,
             command=[],
             stdout="\n".join(all_stdout),
             stderr="\n".join(all_stderr),
             exe_path=None,
             elapsed_ms=(t1 - t0) * 1000.0,
-            skipped=False
+            skipped=False,
+            unit_elapsed_ms=unit_elapsed_ms
         )
+        maybe_log_profile(config, error_result, toolchain)
+        return error_result
     
-    # Link phase (must be sequential)
-    compiler = "gcc" if config.language == "c" else "g++"
-    compiler_path = str(toolchain.bin_dir / f"{compiler}.exe")
+    # Link phase (must be sequential), with fresh and reused objects alike
     link_cmd = [compiler_path]
-    link_cmd.extend([str(obj) for obj in object_files])
+    link_cmd.extend([str(obj_files[f]) for f in config.files])
     link_cmd.extend(["-o", str(exe_path)])
-    if config.features.get("openmp", False) and toolchain.supports_openmp:
-        link_cmd.append("-fopenmp")
-    if config.features.get("graphics", False):
-        link_cmd.extend(["-lbgi", "-lgdi32", "-lcomdlg32", "-luuid", "-lole32", "-loleaut32"])
+    link_cmd.extend(_feature_flags(config, toolchain))
     env = os.environ.copy()
     env["PATH"] = str(toolchain.bin_dir) + os.pathsep + env.get("PATH", "")
     
     try:
-        link_result = subprocess.run(
-            link_cmd,
-            cwd=str(config.root_path),
-            capture_output=True,
-            text=True,
-            env=env
-        )
+        link_result = _run(link_cmd, config.root_path, env)
         if link_result.stdout:
             all_stdout.append(link_result.stdout)
         if link_result.stderr:
             all_stderr.append(link_result.stderr)
         t1 = time.perf_counter()
+        if link_result.returncode == 0:
+            build_state.record(builder_key, snapshot)
+        else:
+            _discard_objects([obj_files[f] for f in to_compile])
         
         final_result = BuildResult(
             success=(link_result.returncode == 0),
@@ -414,12 +625,14 @@ def build_project_parallel(
             stderr="\n".join(all_stderr),
             exe_path=exe_path if link_result.returncode == 0 else None,
             elapsed_ms=(t1 - t0) * 1000.0,
-            skipped=False
+            skipped=False,
+            unit_elapsed_ms=unit_elapsed_ms
         )
         maybe_log_profile(config, final_result, toolchain)
         return final_result
         
     except Exception as e:
+        _discard_objects([obj_files[f] for f in to_compile])
         t1 = time.perf_counter()
         error_result = BuildResult(
             success=False,
@@ -428,7 +641,8 @@ def build_project_parallel(
             stderr="\n".join(all_stderr) + f"\nLink failed: {str(e)}",
             exe_path=None,
             elapsed_ms=(t1 - t0) * 1000.0,
-            skipped=False
+            skipped=False,
+            unit_elapsed_ms=unit_elapsed_ms
         )
         maybe_log_profile(config, error_result, toolchain)
         return error_result
@@ -438,6 +652,18 @@ def build_project(
     toolchains: dict[str, ToolchainConfig],
     force_rebuild: bool = False
 ) -> BuildResult:
+    """Build the project, compiling translation units in parallel when there are several."""
+    if len(config.files) > 2:
+        return build_project_parallel(config, toolchains, force_rebuild)
+    return _build_project_serial(config, toolchains, force_rebuild)
+
+
+def _build_project_serial(
+    config: ProjectConfig,
+    toolchains: dict[str, ToolchainConfig],
+    force_rebuild: bool = False
+) -> BuildResult:
+    """Compile and link every source with a single compiler invocation."""
     toolchain = select_toolchain(config, toolchains)
     
     # Only create build directory for multi-file projects
@@ -446,43 +672,39 @@ def build_project(
         build_dir = config.root_path / "build"
         build_dir.mkdir(exist_ok=True)
     
-    # Check if rebuild is needed (simple timestamp-based check)
-    if not force_rebuild and exe_path.exists():
-        exe_mtime = exe_path.stat().st_mtime
-        needs_recompile = any(
-            (config.root_path / f).stat().st_mtime > exe_mtime
-            for f in config.files
-            if (config.root_path / f).exists()
-        )
-        if not needs_recompile:
-            result = BuildResult(
-                success=True,
-                command=[],
-                stdout="Build skipped: executable is up to date.",
-                stderr="",
-                exe_path=exe_path,
-                elapsed_ms=0.0,
-                skipped=True
-            )
-            maybe_log_profile(config, result, toolchain)
-            return result
-
     cmd = build_command(config, toolchain)
+    
+    # Check if rebuild is needed: stat fast path, content hash for touched files.
+    # Headers reached through #include "..." are tracked along with the sources.
+    sources = [config.root_path / f for f in config.files]
+    tracked = list(_include_graph(config, sources))
+    build_state = BuildState(state_dir(config), config.name)
+    builder_key = BuildState.builder_key_for(cmd)
+    if not force_rebuild and exe_path.exists() and build_state.is_up_to_date(builder_key, tracked):
+        result = BuildResult(
+            success=True,
+            command=[],
+            stdout="Build skipped: executable is up to date.",
+            stderr="",
+            exe_path=exe_path,
+            elapsed_ms=0.0,
+            skipped=True
+        )
+        maybe_log_profile(config, result, toolchain)
+        return result
+    
+    snapshot = build_state.snapshot(tracked)
     env = os.environ.copy()
     env["PATH"] = str(toolchain.bin_dir) + os.pathsep + env.get("PATH", "")
     
     try:
         t0 = time.perf_counter()
-        result = subprocess.run(
-            cmd,
-            cwd=str(config.root_path),
-            capture_output=True,
-            text=True,
-            env=env
-        )
+        result = _run(cmd, config.root_path, env)
         t1 = time.perf_counter()
         elapsed_ms = (t1 - t0) * 1000.0
         exe_path = get_executable_path(config) if result.returncode == 0 else None
+        if result.returncode == 0:
+            build_state.record(builder_key, snapshot)
         build_result = BuildResult(
             success=(result.returncode == 0),
             command=cmd,
@@ -522,13 +744,7 @@ def check_project(
     
     try:
         t0 = time.perf_counter()
-        result = subprocess.run(
-            cmd,
-            cwd=str(config.root_path),
-            capture_output=True,
-            text=True,
-            env=env
-        )
+        result = _run(cmd, config.root_path, env)
         t1 = time.perf_counter()
         elapsed_ms = (t1 - t0) * 1000.0
         
@@ -621,24 +837,91 @@ def run_executable(config: ProjectConfig, toolchains: dict[str, ToolchainConfig]
             skipped=False
         )
 
-def detect_features_from_source(source_path: Path) -> dict[str, bool]:
-    """Detect graphics.h and OpenMP usage by scanning source file."""
-    features = {"graphics": False, "openmp": False}
-    
+def _scan_features(data) -> dict[str, bool]:
+    """Search a bytes-like buffer for graphics.h includes and OpenMP pragmas."""
+    return {
+        "graphics": _GRAPHICS_RE.search(data) is not None,
+        "openmp": _OMP_RE.search(data) is not None,
+    }
+
+@lru_cache(maxsize=4096)
+def _detect_cached(path_str: str, mtime_ns: int, size: int) -> tuple[bool, bool]:
+    """Scan a file once per (path, mtime_ns, size); a changed file gets a new key."""
     try:
-        with open(source_path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
-            
-        # Check for graphics.h include
-        if "#include <graphics.h>" in content or '#include "graphics.h"' in content:
-            features["graphics"] = True
-        
-        # Check for OpenMP pragmas
-        if "#pragma omp" in content:
-            features["openmp"] = True
+        with read_source_bytes(path_str) as data:
+            features = _scan_features(data)
     except Exception:
-        pass  # If file can't be read, assume no special features
-    return features
+        # If file can't be read, assume no special features
+        return (False, False)
+    return (features["graphics"], features["openmp"])
+
+def detect_features_from_source(source_path: Union[Path, bytes]) -> dict[str, bool]:
+    """Detect graphics.h and OpenMP usage by scanning source file.
+    
+    `source_path` may also be the source text itself as a bytes-like object,
+    which is scanned directly. Results for files are memoized on the file's
+    mtime and size, so unchanged sources are not re-read on every build.
+    """
+    if isinstance(source_path, (bytes, bytearray, memoryview)):
+        return _scan_features(source_path)
+    try:
+        st = os.stat(source_path)
+    except OSError:
+        return {"graphics": False, "openmp": False}
+    graphics, openmp = _detect_cached(str(source_path), st.st_mtime_ns, st.st_size)
+    return {"graphics": graphics, "openmp": openmp}
+
+detect_features_from_source.cache_clear = _detect_cached.cache_clear
+
+_SOURCE_SUFFIXES = (".c", ".cpp", ".cc", ".cxx", ".h", ".hpp", ".hh", ".hxx")
+
+
+def _walk_sources(root: Path) -> list[Path]:
+    """C/C++ sources and headers under root, skipping hidden directories."""
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        sources.extend(
+            Path(dirpath, name) for name in filenames
+            if name.lower().endswith(_SOURCE_SUFFIXES)
+        )
+    return sources
+
+
+def _rg_matching_files(pattern: bytes, root: Path) -> Optional[set[Path]]:
+    """Files under root matching pattern according to ripgrep, or None if rg is unusable."""
+    rg = shutil.which("rg")
+    if rg is None:
+        return None
+    cmd = [rg, "-l", "--null", "--no-ignore", "--no-messages"]
+    for suffix in _SOURCE_SUFFIXES:
+        cmd.extend(["--iglob", f"*{suffix}"])
+    cmd.extend(["-e", pattern.decode("ascii"), str(root)])
+    try:
+        result = subprocess.run(cmd, capture_output=True, creationflags=_NO_WINDOW)
+    except OSError:
+        return None
+    if result.returncode not in (0, 1):  # 1 just means no matches
+        return None
+    return {Path(os.fsdecode(p)) for p in result.stdout.split(b"\0") if p}
+
+
+def detect_features_project(root: Path) -> dict[Path, dict[str, bool]]:
+    """Detect graphics.h and OpenMP usage in every source file under root.
+    
+    Uses one ripgrep pass per feature when rg is on PATH; otherwise each
+    file goes through detect_features_from_source.
+    """
+    root = Path(root)
+    sources = _walk_sources(root)
+    graphics = _rg_matching_files(_GRAPHICS_RE.pattern, root)
+    openmp = _rg_matching_files(_OMP_RE.pattern, root) if graphics is not None else None
+    if graphics is None or openmp is None:
+        return {source: detect_features_from_source(source) for source in sources}
+    return {
+        source: {"graphics": source in graphics, "openmp": source in openmp}
+        for source in sources
+    }
 
 def project_config_for_single_file(
     source_path: Path,
@@ -681,7 +964,8 @@ def project_config_for_single_file(
         features=features,
         files=[source_path.name],  # Just filename
         main_file=source_path.name,  # Just filename
-        toolchain_preference=toolchain_preference
+        toolchain_preference=toolchain_preference,
+        standalone=True
     )
 def build_single_file(
     source_path: Path,
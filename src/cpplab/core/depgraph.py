@@ -0,0 +1,148 @@
+# Include graph: which project files each source pulls in via #include "...".
+
+import os
+import re
+import json
+import mmap
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional
+
+_INCLUDE_RE = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*"([^"]+)"', re.MULTILINE)
+# Below this size a plain read beats the cost of setting up a mapping
+_MMAP_MIN_SIZE = 4096
+
+
+@contextmanager
+def read_source_bytes(path):
+    """Yield a file's contents as a bytes-like buffer (bytes, or an mmap for larger files)."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+            yield f.read()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+
+def _cache_file(state_dir: Path) -> Path:
+    return state_dir / "dep_graph.json"
+
+
+def scan_includes(path: Path, include_dirs: Iterable[Path] = ()) -> list[Path]:
+    """Return the quoted includes of `path` that resolve to existing files.
+
+    Follows the compiler's quote-include search order: the including file's
+    directory first, then `include_dirs`. System includes (<...>) and
+    includes that don't resolve are ignored.
+    """
+    with read_source_bytes(path) as data:
+        names = _INCLUDE_RE.findall(data)
+
+    search_dirs = [Path(path).parent, *include_dirs]
+    includes = []
+    for raw in names:
+        name = raw.decode('utf-8', errors='replace')
+        for base in search_dirs:
+            candidate = base / name
+            if candidate.is_file():
+                includes.append(Path(os.path.normpath(candidate)))
+                break
+    return includes
+
+
+def build_graph(
+    files: Iterable[Path],
+    include_dirs: Iterable[Path] = (),
+    cache: Optional[dict] = None
+) -> dict[Path, set[Path]]:
+    """Build the include graph reachable from `files`: node -> set of direct includes.
+
+    If `cache` (as returned by load_graph_cache) is given, a node whose
+    (mtime_ns, size) matches its cached entry reuses the cached edges and
+    only changed files are re-scanned. The cache is updated in place.
+    """
+    include_dirs = list(include_dirs)
+    graph: dict[Path, set[Path]] = {}
+    queue = deque(Path(f) for f in files)
+
+    while queue:
+        node = queue.popleft()
+        if node in graph:
+            continue
+
+        try:
+            st = os.stat(node)
+        except OSError:
+            graph[node] = set()  # Missing file: the compiler will report it
+            continue
+
+        key = str(node)
+        entry = cache.get(key) if cache is not None else None
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            edges = {Path(p) for p in entry['includes']}
+        else:
+            try:
+                edges = set(scan_includes(node, include_dirs))
+            except OSError:
+                edges = set()
+            if cache is not None:
+                cache[key] = {
+                    'mtime_ns': st.st_mtime_ns,
+                    'size': st.st_size,
+                    'includes': sorted(str(p) for p in edges)
+                }
+
+        graph[node] = edges
+        queue.extend(edges - graph.keys())
+
+    return graph
+
+
+def affected_sources(
+    graph: dict[Path, set[Path]],
+    sources: Iterable[Path],
+    dirty: Iterable[Path]
+) -> set[Path]:
+    """Return the sources whose transitive includes (or themselves) intersect `dirty`.
+
+    Walks the reversed graph breadth-first from the dirty nodes, so the cost
+    is proportional to the changed subtree rather than the whole project.
+    """
+    reverse: dict[Path, set[Path]] = {}
+    for node, edges in graph.items():
+        for dep in edges:
+            reverse.setdefault(dep, set()).add(node)
+
+    seen = set(dirty)
+    queue = deque(seen)
+    while queue:
+        node = queue.popleft()
+        for parent in reverse.get(node, ()):
+            if parent not in seen:
+                seen.add(parent)
+                queue.append(parent)
+
+    return {s for s in sources if s in seen}
+
+
+def load_graph_cache(state_dir: Path) -> dict:
+    """Load the per-node scan cache from <state_dir>/dep_graph.json."""
+    try:
+        with open(_cache_file(state_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}  # Missing or corrupt cache: re-scan everything
+
+
+def save_graph_cache(state_dir: Path, cache: dict) -> None:
+    """Persist the scan cache atomically (write temp file, then os.replace)."""
+    path = _cache_file(state_dir)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+    except Exception:
+        pass  # Silently fail, the graph is rebuilt next time
@@ -1,12 +1,19 @@
 # Project configuration: metadata, persistence, and project creation.
 
+import os
 import json
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Literal
 
+try:
+    import orjson  # Optional: faster (de)serialization of .cpplab.json
+except ImportError:
+    orjson = None
 
-@dataclass
+
+# slots: one instance per open project, no per-instance __dict__
+@dataclass(slots=True)
 class ProjectConfig: #normalization for this to always be path bug fixed
     name: str
     root_path: Path
@@ -17,7 +24,8 @@ class ProjectConfig: #normalization for this to always be path bug fixed
     files: list[Path]
     main_file: Path
     toolchain_preference: str = "auto"  # "auto", "mingw64", "mingw32"
-    
+    # A lone source file opened without a project (not persisted)
+    standalone: bool = False
     @property
     def graphics(self) -> bool:
         """Convenience property for graphics feature."""
@@ -42,8 +50,8 @@ class ProjectConfig: #normalization for this to always be path bug fixed
         root = Path(project_dir)
         config_path = root / ".cpplab.json"
         
-        with open(config_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        raw = config_path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
         return ProjectConfig(
             name=data["name"],
@@ -71,8 +79,16 @@ class ProjectConfig: #normalization for this to always be path bug fixed
             "toolchain_preference": self.toolchain_preference
         }
         
-        with open(config_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2).encode("utf-8")
+        
+        # Write a temp file and swap it in, so a crash never leaves a half-written config
+        tmp_path = config_path.with_name(config_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, config_path)
 
 
 def create_new_project(
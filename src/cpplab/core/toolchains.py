@@ -3,7 +3,7 @@
 import sys
 from functools import lru_cache
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -13,6 +13,8 @@ class ToolchainConfig:
     root_dir: Path
     is_32bit: bool
     supports_openmp: bool
+    # Set once the compiler has been found; checked before touching the disk
+    _available: bool = field(default=False, init=False, repr=False, compare=False)
     
     @property
     def bin_dir(self) -> Path:
@@ -35,7 +37,11 @@ class ToolchainConfig:
         return self.bin_dir / "g++.exe"
     
     def is_available(self) -> bool:
-        return self.bin_dir.exists() and self.cpp_compiler.exists()
+        # Only a positive result is kept, so a toolchain installed while
+        # the IDE is running is still picked up on the next check
+        if not self._available:
+            self._available = self.bin_dir.exists() and self.cpp_compiler.exists()
+        return self._available
 
 
 def get_app_root() -> Path:
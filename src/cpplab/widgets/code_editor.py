@@ -1,6 +1,7 @@
 # Code editor widget with syntax highlighting.
 
 import re
+from array import array
 from PyQt6.QtWidgets import QPlainTextEdit
 from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QTextCursor
 from PyQt6.QtCore import Qt, QRegularExpression, QTimer, pyqtSignal
@@ -8,105 +9,219 @@ from typing import Optional
 
 
 class TrieNode:
+    __slots__ = ('children', 'is_keyword')
+    
     def __init__(self):
         self.children = {}
         self.is_keyword = False
-        self.format = None
+
+
+_KEYWORDS: tuple[str, ...] = (
+    "auto", "break", "case", "char", "const", "continue", "default",
+    "do", "double", "else", "enum", "extern", "float", "for", "goto",
+    "if", "int", "long", "register", "return", "short", "signed",
+    "sizeof", "static", "struct", "switch", "typedef", "union",
+    "unsigned", "void", "volatile", "while", "class", "namespace",
+    "private", "protected", "public", "template", "this", "virtual",
+    "bool", "true", "false", "nullptr", "using", "include", "define"
+)
+
+
+def _build_keyword_trie() -> TrieNode:
+    """Builds a Trie in O(total chars in keywords), query in O(length of word)."""
+    root = TrieNode()
+    
+    for word in _KEYWORDS:
+        node = root
+        for char in word:
+            if char not in node.children:
+                node.children[char] = TrieNode()
+            node = node.children[char]
+        node.is_keyword = True
+    return root
+
+
+def _flatten_trie(root: TrieNode) -> tuple[array, bytes]:
+    """Flatten the trie into a transition table indexed by node_id * 128 + ord(char).
+    
+    Keywords are pure ASCII, so every node gets 128 child slots (-1 = no child).
+    Walking the table is a single list index per character instead of a dict
+    lookup on a separate heap object per node.
+    """
+    nodes = [root]
+    ids = {id(root): 0}
+    for node in nodes:  # BFS; nodes grows while we iterate
+        for child in node.children.values():
+            ids[id(child)] = len(nodes)
+            nodes.append(child)
+    
+    trie_next = array('i', [-1]) * (len(nodes) * 128)
+    is_keyword = bytearray(len(nodes))
+    for node_id, node in enumerate(nodes):
+        is_keyword[node_id] = node.is_keyword
+        for char, child in node.children.items():
+            trie_next[node_id * 128 + ord(char)] = ids[id(child)]
+    return trie_next, bytes(is_keyword)
+
+
+# Shared, read-only across every editor tab: built once at import
+_TRIE_NEXT, _TRIE_IS_KEYWORD = _flatten_trie(_build_keyword_trie())
+_STRING_PATTERN = re.compile(r'"[^"]*"|\'[^\']*\'')
+# String literals are matched too, so a "/*" or "//" inside one is skipped
+_COMMENT_START_PATTERN = re.compile(_STRING_PATTERN.pattern + r'|//|/\*')
+_PREPROCESSOR_PATTERN = re.compile(r'#[^\n]*')
+_LEAD_WS_RE = re.compile(r'[ \t]*')
+# 1 for identifier characters (alnum or '_') in the Latin-1 range; anything
+# above falls back to str.isalnum()
+_IS_WORDCHAR = bytes(1 if (chr(i).isalnum() or i == ord('_')) else 0 for i in range(256))
+
 
 class FastSyntaxHighlighter(QSyntaxHighlighter):
     """Using Trie (Prefix Tree) for keyword matching + Boyer-Moore for strings for faster keyword matching.
     Reduces complexity from O(n × m) (text × patterns) to O(n) + O(k) (linear scan + keyword length).
     Time to say goodbye to app lags :D
     """
+    # Block state for lines that end inside an unterminated /* ... */ comment
+    IN_COMMENT = 1
+    
+    # Formats are shared by all instances; created lazily once a QApplication exists
+    _formats: Optional[dict[str, QTextCharFormat]] = None
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.keyword_trie = self._build_keyword_trie()
-        #now compiling regex once, for all
-        self.string_pattern = re.compile(r'"[^"]*"|\'[^\']*\'')
-        self.comment_pattern = re.compile(r'//.*$|/\*.*?\*/', re.MULTILINE)
-        self.preprocessor_pattern = re.compile(r'#[^\n]*')
-    
-    def _build_keyword_trie(self):
-        """Builds a Trie in O(total chars in keywords), query in O(length of word)."""
-        root = TrieNode()
-        keywords = [
-            "auto", "break", "case", "char", "const", "continue", "default",
-            "do", "double", "else", "enum", "extern", "float", "for", "goto",
-            "if", "int", "long", "register", "return", "short", "signed",
-            "sizeof", "static", "struct", "switch", "typedef", "union",
-            "unsigned", "void", "volatile", "while", "class", "namespace",
-            "private", "protected", "public", "template", "this", "virtual",
-            "bool", "true", "false", "nullptr", "using", "include", "define"
-        ]
-        
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(QColor("#0000FF"))
-        keyword_format.setFontWeight(QFont.Weight.Bold)
-        
-        for word in keywords:
-            node = root
-            for char in word:
-                if char not in node.children:
-                    node.children[char] = TrieNode()
-                node = node.children[char]
-            node.is_keyword = True
-            node.format = keyword_format
-        return root
+        self.trie_next = _TRIE_NEXT
+        self.trie_is_keyword = _TRIE_IS_KEYWORD
+        self.string_pattern = _STRING_PATTERN
+        self.comment_start_pattern = _COMMENT_START_PATTERN
+        self.preprocessor_pattern = _PREPROCESSOR_PATTERN
     
-    def _is_word_boundary(self, text: str, pos: int) -> bool:
-        """Check if position is a word boundary."""
-        if pos < 0 or pos >= len(text):
-            return True
-        return not (text[pos].isalnum() or text[pos] == '_')
+    @classmethod
+    def _get_formats(cls) -> dict[str, QTextCharFormat]:
+        """Create the shared text formats on first use."""
+        if cls._formats is None:
+            keyword_fmt = QTextCharFormat()
+            keyword_fmt.setForeground(QColor("#0000FF"))
+            keyword_fmt.setFontWeight(QFont.Weight.Bold)
+            
+            string_fmt = QTextCharFormat()
+            string_fmt.setForeground(QColor("#008000"))
+            
+            comment_fmt = QTextCharFormat()
+            comment_fmt.setForeground(QColor("#808080"))
+            comment_fmt.setFontItalic(True)
+            
+            preprocessor_fmt = QTextCharFormat()
+            preprocessor_fmt.setForeground(QColor("#800080"))
+            
+            cls._formats = {
+                "keyword": keyword_fmt,
+                "string": string_fmt,
+                "comment": comment_fmt,
+                "preprocessor": preprocessor_fmt,
+            }
+        return cls._formats
     
     def highlightBlock(self, text):
+        in_comment = self.previousBlockState() == self.IN_COMMENT
+        
+        # Blank and whitespace-only lines have nothing to format, but a
+        # /* ... */ comment that is still open must carry on past them
+        if not text or text.isspace():
+            self.setCurrentBlockState(self.IN_COMMENT if in_comment else 0)
+            return
+        
+        formats = self._get_formats()
+        comment_fmt = formats["comment"]
+        
+        # Finish a block comment continued from the previous line
+        code_start = 0
+        if in_comment:
+            end = text.find('*/')
+            if end == -1:
+                self.setFormat(0, len(text), comment_fmt)
+                self.setCurrentBlockState(self.IN_COMMENT)
+                return
+            code_start = end + 2
+        
         # single pass highlight
         length = len(text)
         i = 0
         
         # Highlight keywords using Trie
+        keyword_fmt = formats["keyword"]
+        trie_next = self.trie_next
+        trie_is_keyword = self.trie_is_keyword
+        is_wordchar = _IS_WORDCHAR
         while i < length:
-            # Check if we're at a word start
-            if i == 0 or self._is_word_boundary(text, i - 1):
-                node = self.keyword_trie
-                j = i
-                last_keyword_end = -1
-                last_format = None
-                
-                # Walk the trie
-                while j < length and text[j] in node.children:
-                    node = node.children[text[j]]
-                    j += 1
-                    if node.is_keyword and self._is_word_boundary(text, j):
-                        last_keyword_end = j
-                        last_format = node.format
-                
-                # Apply format if we found a keyword
-                if last_keyword_end > i and last_format:
-                    self.setFormat(i, last_keyword_end - i, last_format)
-                    i = last_keyword_end
+            # Keywords can only start at a word boundary
+            if i:
+                code = ord(text[i - 1])
+                if is_wordchar[code] if code < 256 else text[i - 1].isalnum():
+                    i += 1
                     continue
+            
+            cur = 0
+            j = i
+            last_keyword_end = -1
+            
+            # Walk the trie
+            while j < length:
+                code = ord(text[j])
+                nxt = trie_next[cur * 128 + code] if code < 128 else -1
+                if nxt < 0:
+                    break
+                cur = nxt
+                j += 1
+                if trie_is_keyword[cur]:
+                    if j == length:
+                        last_keyword_end = j
+                    else:
+                        code = ord(text[j])
+                        if not (is_wordchar[code] if code < 256 else text[j].isalnum()):
+                            last_keyword_end = j
+            
+            # Apply format if we found a keyword
+            if last_keyword_end > i:
+                self.setFormat(i, last_keyword_end - i, keyword_fmt)
+                i = last_keyword_end
+                continue
             i += 1
         
         # Highlight strings using precompiled regex
-        string_fmt = QTextCharFormat()
-        string_fmt.setForeground(QColor("#008000"))
+        string_fmt = formats["string"]
         for match in self.string_pattern.finditer(text):
             start, end = match.span()
             self.setFormat(start, end - start, string_fmt)
         
-        # Highlight comments using precompiled regex
-        comment_fmt = QTextCharFormat()
-        comment_fmt.setForeground(QColor("#808080"))
-        comment_fmt.setFontItalic(True)
-        for match in self.comment_pattern.finditer(text):
-            start, end = match.span()
-            self.setFormat(start, end - start, comment_fmt)
+        # Highlight comments, tracking /* ... */ across blocks via the block state
+        if code_start:
+            self.setFormat(0, code_start, comment_fmt)
+        pos = code_start
+        in_comment = False
+        while True:
+            match = self.comment_start_pattern.search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            token = match.group()
+            if token[0] in '"\'':
+                pos = match.end()
+                continue
+            if token == '//':
+                self.setFormat(start, length - start, comment_fmt)
+                break
+            end = text.find('*/', match.end())
+            if end == -1:
+                self.setFormat(start, length - start, comment_fmt)
+                in_comment = True
+                break
+            self.setFormat(start, end + 2 - start, comment_fmt)
+            pos = end + 2
+        self.setCurrentBlockState(self.IN_COMMENT if in_comment else 0)
         
         # Highlight preprocessor directives
-        preprocessor_fmt = QTextCharFormat()
-        preprocessor_fmt.setForeground(QColor("#800080"))
-        for match in self.preprocessor_pattern.finditer(text):
+        preprocessor_fmt = formats["preprocessor"]
+        for match in self.preprocessor_pattern.finditer(text, code_start):
             start, end = match.span()
             self.setFormat(start, end - start, preprocessor_fmt)
 
@@ -207,70 +322,52 @@ class CodeEditor(QPlainTextEdit):
     
     def _indent_selection(self, cursor):
         """Indent all lines in the selection."""
-        # Get selection start and end
-        start = cursor.selectionStart()
-        end = cursor.selectionEnd()
-        
-        # Move to start of selection
-        cursor.setPosition(start)
-        cursor.movePosition(QTextCursor.MoveOperation.StartOfLine)
-        
-        # Get the block at start and end
-        start_block = cursor.block()
-        cursor.setPosition(end)
-        end_block = cursor.block()
-        
         # Prepare indentation string
         indent_str = ' ' * self.tab_size if self.use_spaces else '\t'
-        
-        # Start edit block for undo/redo
-        cursor.beginEditBlock()
-        
-        # Iterate through all blocks in selection
-        cursor.setPosition(start_block.position())
-        while True:
-            cursor.movePosition(QTextCursor.MoveOperation.StartOfLine)
-            cursor.insertText(indent_str)
-            
-            if cursor.block() == end_block:
-                break
-            
-            if not cursor.movePosition(QTextCursor.MoveOperation.NextBlock):
-                break
-        
-        cursor.endEditBlock()
+        self._rewrite_selected_lines(cursor, lambda text: re.sub(r'(?m)^', indent_str, text))
     
     def _unindent_selection(self, cursor):
         """Unindent all lines in the selection."""
-        # Get selection start and end
-        start = cursor.selectionStart()
-        end = cursor.selectionEnd()
-        
-        # Move to start of selection
-        cursor.setPosition(start)
-        cursor.movePosition(QTextCursor.MoveOperation.StartOfLine)
-        
-        # Get the block at start and end
-        start_block = cursor.block()
-        cursor.setPosition(end)
-        end_block = cursor.block()
+        unindent_re = re.compile(r'(?m)^(?:\t| {1,' + str(self.tab_size) + r'})')
+        self._rewrite_selected_lines(cursor, lambda text: unindent_re.sub('', text))
+    
+    def _rewrite_selected_lines(self, cursor, transform):
+        """Replace the full lines covered by the selection with transform(text).
+        
+        The lines are rewritten with a single insertText so a large selection
+        costs one document edit instead of one per line.
+        """
+        doc = self.document()
+        start_block = doc.findBlock(cursor.selectionStart())
+        end_block = doc.findBlock(cursor.selectionEnd())
+        # Block handles don't survive the edit, so remember where we started
+        start_pos = start_block.position()
+        start_number = start_block.blockNumber()
+        
+        # Select whole lines, from the first line start to the last line end
+        cursor.setPosition(start_pos)
+        cursor.setPosition(
+            end_block.position() + end_block.length() - 1,
+            QTextCursor.MoveMode.KeepAnchor
+        )
+        old_text = cursor.selection().toPlainText()
+        new_text = transform(old_text)
+        if new_text == old_text:
+            return
         
         # Start edit block for undo/redo
         cursor.beginEditBlock()
-        
-        # Iterate through all blocks in selection
-        cursor.setPosition(start_block.position())
-        while True:
-            cursor.movePosition(QTextCursor.MoveOperation.StartOfLine)
-            self._remove_indentation_from_line(cursor)
-            
-            if cursor.block() == end_block:
-                break
-            
-            if not cursor.movePosition(QTextCursor.MoveOperation.NextBlock):
-                break
-        
+        cursor.insertText(new_text)
         cursor.endEditBlock()
+        
+        # Keep the rewritten lines selected so Tab/Shift+Tab can be repeated
+        last_block = doc.findBlockByNumber(start_number + new_text.count('\n'))
+        cursor.setPosition(start_pos)
+        cursor.setPosition(
+            last_block.position() + last_block.length() - 1,
+            QTextCursor.MoveMode.KeepAnchor
+        )
+        self.setTextCursor(cursor)
     
     def _unindent_line(self, cursor):
         """Unindent the current line."""
@@ -287,7 +384,8 @@ class CodeEditor(QPlainTextEdit):
             return
         
         # Count leading whitespace
-        leading_spaces = len(line_text) - len(line_text.lstrip(' \t'))
+        leading = _LEAD_WS_RE.match(line_text).group(0)
+        leading_spaces = len(leading)
         
         if leading_spaces == 0:
             return
@@ -299,7 +397,7 @@ class CodeEditor(QPlainTextEdit):
             
             # Count actual spaces (not tabs)
             space_count = 0
-            for char in line_text[:leading_spaces]:
+            for char in leading:
                 if char == ' ':
                     space_count += 1
                     if space_count >= to_remove:
@@ -309,7 +407,7 @@ class CodeEditor(QPlainTextEdit):
                     to_remove = 1
                     break
             
-            to_remove = min(to_remove, space_count) if space_count > 0 else (1 if '\t' in line_text[:leading_spaces] else 0)
+            to_remove = min(to_remove, space_count) if space_count > 0 else (1 if '\t' in leading else 0)
         else:
             # Remove one tab or up to tab_size spaces
             if line_text[0] == '\t':
@@ -343,12 +441,7 @@ class CodeEditor(QPlainTextEdit):
     
     def _get_line_indentation(self, line: str) -> str:
         """Get the indentation string from a line."""
-        indent = ''
-        for char in line:
-            if char in ' \t':
-                indent += char
-            else:
-                break
+        indent = _LEAD_WS_RE.match(line).group(0)
         
         # Convert tabs to spaces if using spaces
         if self.use_spaces and '\t' in indent:
@@ -372,18 +465,26 @@ class CodeEditor(QPlainTextEdit):
         # Temporarily disconnect textChanged to prevent it from firing during setPlainText
         self.textChanged.disconnect(self._on_text_changed)
         
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        self.setPlainText(content)
-        self.file_path = file_path
-        
-        # Mark both our flag and Qt's document as unmodified
-        self.document().setModified(False)
-        self.is_modified = False
-        
-        # Reconnect textChanged signal
-        self.textChanged.connect(self._on_text_changed)
-        self._loading = False
+        # Detach the highlighter so the load doesn't highlight every block
+        # synchronously; reattaching schedules a single pass afterwards
+        self.highlighter.setDocument(None)
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            # Strict: a non-UTF-8 file raises (and is reported) rather than
+            # being silently mangled and written back on the next save
+            self.setPlainText(data.decode("utf-8"))
+            del data
+            self.file_path = file_path
+            
+            # Mark both our flag and Qt's document as unmodified
+            self.document().setModified(False)
+            self.is_modified = False
+        finally:
+            self.highlighter.setDocument(self.document())
+            # Reconnect textChanged signal
+            self.textChanged.connect(self._on_text_changed)
+            self._loading = False
     
     def save_file(self):
         if not self.file_path:
@@ -2,6 +2,7 @@
 
 from PyQt6.QtWidgets import QPlainTextEdit
 from PyQt6.QtGui import QFont, QTextCursor
+from PyQt6.QtCore import QTimer
 
 
 class OutputPanel(QPlainTextEdit):
@@ -9,14 +10,39 @@ class OutputPanel(QPlainTextEdit):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setReadOnly(True)
+        # Keep only the most recent lines; Qt drops the oldest blocks on append
+        self.setMaximumBlockCount(10000)
         
         font = QFont("Consolas", 9)
         font.setStyleHint(QFont.StyleHint.Monospace)
         self.setFont(font)
+        
+        # Lines are buffered and appended in one go every 50ms, so a burst of
+        # compiler output costs one document edit instead of one per line
+        self._pending: list[str] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.timeout.connect(self._flush)
     
     def append_output(self, text: str):
-        self.appendPlainText(text)
+        self._pending.append(text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def flush(self):
+        """Append any buffered output immediately (e.g. when a build finishes)."""
+        self._flush_timer.stop()
+        self._flush()
+    
+    def _flush(self):
+        if not self._pending:
+            return
+        self.appendPlainText('\n'.join(self._pending))
+        self._pending.clear()
         self.moveCursor(QTextCursor.MoveOperation.End)
     
     def clear_output(self):
+        self._flush_timer.stop()
+        self._pending.clear()
         self.clear()
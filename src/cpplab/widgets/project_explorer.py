@@ -1,8 +1,8 @@
 # Project explorer tree widget for navigating project files.
 
+import os
 from PyQt6.QtWidgets import QTreeWidget, QTreeWidgetItem
-from PyQt6.QtCore import pyqtSignal
-from pathlib import Path
+from PyQt6.QtCore import Qt, pyqtSignal
 from typing import Optional
 from ..core.project_config import ProjectConfig
 
@@ -20,21 +20,26 @@ class ProjectExplorer(QTreeWidget):
     
     def load_project(self, project_config: ProjectConfig):
         self.project_config = project_config
+        # Suppress repaints while the tree is rebuilt
+        self.setUpdatesEnabled(False)
         self.clear()
         
         root_item = QTreeWidgetItem([project_config.name])
         self.addTopLevelItem(root_item)
-        root_item.setExpanded(True)
         
+        # Each item carries its absolute path, so a double click needs no lookup
+        root_path = project_config.root_path
+        items = []
         for file_path in project_config.files:
-            file_item = QTreeWidgetItem([Path(file_path).name])
-            file_item.setData(0, 0x0100, file_path)
-            root_item.addChild(file_item)
+            file_item = QTreeWidgetItem([os.path.basename(file_path)])
+            file_item.setData(0, Qt.ItemDataRole.UserRole, str(root_path / file_path))
+            items.append(file_item)
+        # One model insert for all files instead of one per file
+        root_item.addChildren(items)
+        root_item.setExpanded(True)
+        self.setUpdatesEnabled(True)
     
     def _on_item_double_clicked(self, item: QTreeWidgetItem, column: int):
-        file_rel_path = item.data(0, 0x0100) #tiny bug for path fixed, this could've been str or Path
-        if file_rel_path and self.project_config:
-            # Normalize to Path (handles Path or str)
-            rel = Path(file_rel_path)
-            full_path = str(self.project_config.root_path / rel)
+        full_path = item.data(0, Qt.ItemDataRole.UserRole)
+        if full_path:
             self.file_double_clicked.emit(full_path)
@@ -0,0 +1,43 @@
+# Shared helpers for the demo scripts: background cleanup and buffered output.
+
+import atexit
+import shutil
+import sys
+import threading
+import time
+
+_pending: list[threading.Thread] = []
+
+# Diagnostics are collected per phase and written in one go, so console
+# I/O doesn't interleave with the builds being timed
+log: list[str] = []
+
+
+def buffer_stdout() -> None:
+    """Switch stdout to fully buffered mode; call from a script's __main__ block."""
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
+
+def flush_log() -> None:
+    """Write the collected lines in a single call and start a new phase."""
+    sys.stdout.write("\n".join(log) + "\n")
+    sys.stdout.flush()
+    log.clear()
+
+
+def async_rmtree(path) -> None:
+    """Delete `path` on a daemon thread so the caller doesn't wait on it."""
+    thread = threading.Thread(
+        target=shutil.rmtree, args=(path,), kwargs={"ignore_errors": True}, daemon=True
+    )
+    thread.start()
+    _pending.append(thread)
+
+
+@atexit.register
+def _join_pending(timeout: float = 2.0) -> None:
+    # Give outstanding deletions a bounded chance to finish before exit
+    deadline = time.monotonic() + timeout
+    for thread in _pending:
+        thread.join(max(0.0, deadline - time.monotonic()))
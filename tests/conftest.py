@@ -1,8 +1,56 @@
 # Shared pytest configuration and fixtures.
 
 import sys
+import pytest
 from pathlib import Path
 
 # Add src to path for imports
 repo_root = Path(__file__).parent.parent
 sys.path.insert(0, str(repo_root))
+
+
+@pytest.fixture(scope="session")
+def scratch_dir(tmp_path_factory):
+    """One scratch directory shared by the whole session; tests use unique file names."""
+    return tmp_path_factory.mktemp("featdet")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """A single QApplication for every widget test in the session."""
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def fake_toolchain_mingw64():
+    """Fake mingw64 toolchain."""
+    from src.cpplab.core.toolchains import ToolchainConfig
+    return ToolchainConfig(
+        name="mingw64",
+        root_dir=Path("/fake/compilers/mingw64"),
+        is_32bit=False,
+        supports_openmp=True
+    )
+
+
+@pytest.fixture
+def fake_toolchain_mingw32():
+    """Fake mingw32 toolchain."""
+    from src.cpplab.core.toolchains import ToolchainConfig
+    return ToolchainConfig(
+        name="mingw32",
+        root_dir=Path("/fake/compilers/mingw32"),
+        is_32bit=True,
+        supports_openmp=False
+    )
+
+
+@pytest.fixture
+def fake_toolchains(fake_toolchain_mingw32, fake_toolchain_mingw64):
+    """Dictionary of fake toolchains."""
+    return {
+        "mingw32": fake_toolchain_mingw32,
+        "mingw64": fake_toolchain_mingw64
+    }
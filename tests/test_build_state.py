@@ -0,0 +1,274 @@
+# Tests for incremental build skipping (mtime fast path + content hash fallback).
+
+import os
+import sys
+import json
+import subprocess
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from src.cpplab.core.builder import (
+    BuildState, _run, build_project, build_project_parallel, build_single_file
+)
+from src.cpplab.core.project_config import ProjectConfig
+from src.cpplab.core.toolchains import ToolchainConfig
+
+
+def _fake_compile(cmd, cwd, env):
+    """Stand-in for the compiler: just creates the -o output."""
+    out = Path(cmd[cmd.index("-o") + 1])
+    out.write_bytes(b"MZ")
+    return subprocess.CompletedProcess(cmd, 0, "", "")
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "main.cpp").write_text("int main() { return 0; }\n")
+    return ProjectConfig(
+        name="incremental",
+        root_path=tmp_path,
+        language="cpp",
+        standard="c++17",
+        project_type="console",
+        features={"graphics": False, "openmp": False},
+        files=[Path("main.cpp")],
+        main_file=Path("main.cpp"),
+        toolchain_preference="auto"
+    )
+
+
+@pytest.fixture(autouse=True)
+def fake_compiler():
+    with patch.object(ToolchainConfig, 'is_available', return_value=True), \
+         patch('src.cpplab.core.builder._run', side_effect=_fake_compile) as run:
+        yield run
+
+
+def test_second_build_is_skipped(project, fake_toolchains, fake_compiler):
+    """An unchanged project is not rebuilt."""
+    first = build_project(project, fake_toolchains)
+    assert first.success and not first.skipped
+
+    second = build_project(project, fake_toolchains)
+    assert second.skipped
+    assert fake_compiler.call_count == 1
+    assert (project.root_path / ".cpplab" / "build_state.json").exists()
+
+
+def test_touched_but_unchanged_source_is_skipped(project, fake_toolchains, fake_compiler):
+    """Bumping the mtime without changing content doesn't trigger a rebuild."""
+    build_project(project, fake_toolchains)
+
+    source = project.root_path / "main.cpp"
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+    assert build_project(project, fake_toolchains).skipped
+    assert fake_compiler.call_count == 1
+
+
+def test_changed_source_is_rebuilt(project, fake_toolchains, fake_compiler):
+    """Editing a source rebuilds it."""
+    build_project(project, fake_toolchains)
+
+    (project.root_path / "main.cpp").write_text("int main() { return 10; }\n")
+
+    result = build_project(project, fake_toolchains)
+    assert not result.skipped
+    assert fake_compiler.call_count == 2
+
+
+def test_changed_flags_invalidate_state(project, fake_toolchains, fake_compiler):
+    """A different compile command (here the standard) forces a rebuild."""
+    build_project(project, fake_toolchains)
+
+    project.standard = "c++20"
+
+    assert not build_project(project, fake_toolchains).skipped
+    assert fake_compiler.call_count == 2
+
+
+def test_changed_header_is_rebuilt(project, fake_toolchains, fake_compiler):
+    """Headers pulled in with #include "..." are tracked too."""
+    (project.root_path / "config.h").write_text("#define N 1\n")
+    (project.root_path / "main.cpp").write_text('#include "config.h"\nint main() { return N; }\n')
+    build_project(project, fake_toolchains)
+    assert build_project(project, fake_toolchains).skipped
+
+    (project.root_path / "config.h").write_text("#define N 20\n")
+
+    assert not build_project(project, fake_toolchains).skipped
+    assert fake_compiler.call_count == 2
+
+
+def test_parallel_build_recompiles_only_affected_units(project, fake_toolchains, fake_compiler):
+    """Only sources whose include closure changed are recompiled; the rest reuse objects."""
+    root = project.root_path
+    (root / "shared.h").write_text("int shared();\n")
+    (root / "a.cpp").write_text('#include "shared.h"\nint a() { return shared(); }\n')
+    (root / "b.cpp").write_text("int b() { return 2; }\n")
+    project.files = [Path("main.cpp"), Path("a.cpp"), Path("b.cpp")]
+
+    def compiled_sources():
+        return {Path(c.args[0][1]).name for c in fake_compiler.call_args_list if "-c" in c.args[0]}
+
+    assert build_project_parallel(project, fake_toolchains).success
+    assert compiled_sources() == {"main.cpp", "a.cpp", "b.cpp"}
+    assert build_project_parallel(project, fake_toolchains).skipped
+
+    fake_compiler.reset_mock()
+    (root / "shared.h").write_text("long shared();\n")
+
+    result = build_project_parallel(project, fake_toolchains)
+    assert result.success and not result.skipped
+    assert compiled_sources() == {"a.cpp"}
+    # Every object is still linked
+    assert [Path(p).name for p in result.command if p.endswith(".o")] == ["main.o", "a.o", "b.o"]
+
+
+def test_failed_link_does_not_leave_stale_objects(project, fake_toolchains, fake_compiler):
+    """Objects compiled for a build whose link failed are not reused once the edit is undone."""
+    root = project.root_path
+    (root / "a.cpp").write_text("int a() { return 1; }\n")
+    (root / "b.cpp").write_text("int b() { return 2; }\n")
+    project.files = [Path("main.cpp"), Path("a.cpp"), Path("b.cpp")]
+    assert build_project_parallel(project, fake_toolchains).success
+
+    def failing_link(cmd, cwd, env):
+        if "-c" in cmd:
+            return _fake_compile(cmd, cwd, env)
+        return subprocess.CompletedProcess(cmd, 1, "", "undefined reference to `undefined_fn'")
+
+    original = (root / "b.cpp").read_text()
+    (root / "b.cpp").write_text("int undefined_fn(); int b() { return undefined_fn(); }\n")
+    fake_compiler.side_effect = failing_link
+    assert not build_project_parallel(project, fake_toolchains).success
+
+    # Undo the edit: the record matches again, but b's object came from the edit
+    (root / "b.cpp").write_text(original)
+    fake_compiler.side_effect = _fake_compile
+    fake_compiler.reset_mock()
+    result = build_project_parallel(project, fake_toolchains)
+
+    assert result.success and not result.skipped
+    assert [Path(c.args[0][1]).name for c in fake_compiler.call_args_list if "-c" in c.args[0]] == ["b.cpp"]
+
+
+def test_multi_file_build_compiles_each_unit(project, fake_toolchains, fake_compiler, monkeypatch):
+    """build_project compiles multi-file projects per translation unit, then links once."""
+    monkeypatch.setenv("CPPLAB_BUILD_JOBS", "1")
+    root = project.root_path
+    (root / "a.cpp").write_text("int a() { return 1; }\n")
+    (root / "b.cpp").write_text("int b() { return 2; }\n")
+    project.files = [Path("main.cpp"), Path("a.cpp"), Path("b.cpp")]
+
+    result = build_project(project, fake_toolchains)
+
+    assert result.success
+    assert set(result.unit_elapsed_ms) == {"main.cpp", "a.cpp", "b.cpp"}
+    assert fake_compiler.call_count == 4  # three compiles and one link
+
+
+def test_profile_log_appends_one_line_per_build(project, fake_toolchains, monkeypatch):
+    """Each build appends one complete JSON line to the profile log."""
+    monkeypatch.setenv("CPPLAB_PROFILE_BUILDS", "1")
+
+    build_project(project, fake_toolchains)
+    build_project(project, fake_toolchains)
+
+    lines = (project.root_path / "build_profile.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["skipped"] for line in lines] == [False, True]
+
+
+def test_parallel_build_logs_skips_and_compile_failures(project, fake_toolchains, fake_compiler, monkeypatch):
+    """Multi-file builds log every outcome, including skipped and failed-compile ones."""
+    monkeypatch.setenv("CPPLAB_PROFILE_BUILDS", "1")
+    root = project.root_path
+    (root / "a.cpp").write_text("int a() { return 1; }\n")
+    (root / "b.cpp").write_text("int b() { return 2; }\n")
+    project.files = [Path("main.cpp"), Path("a.cpp"), Path("b.cpp")]
+
+    build_project(project, fake_toolchains)
+    build_project(project, fake_toolchains)
+    (root / "b.cpp").write_text("int b() { return }\n")
+    fake_compiler.side_effect = lambda cmd, cwd, env: subprocess.CompletedProcess(cmd, 1, "", "error")
+    build_project(project, fake_toolchains)
+
+    lines = (root / "build_profile.jsonl").read_text(encoding="utf-8").splitlines()
+    entries = [json.loads(line) for line in lines]
+    assert [(e["success"], e["skipped"]) for e in entries] == [(True, False), (True, True), (False, False)]
+
+
+def test_dirty_scan_over_many_files(tmp_path):
+    """Large file sets (stat'ed and hashed on a thread pool) report exactly the changed files."""
+    files = []
+    for i in range(100):
+        path = tmp_path / f"unit{i}.cpp"
+        path.write_text(f"int f{i}() {{ return {i}; }}\n")
+        files.append(path)
+    state = BuildState(tmp_path, "many")
+    state.record("key", state.snapshot(files))
+
+    touched, edited = files[3], files[42]
+    st = touched.stat()
+    os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    edited.write_text("int f42() { return -42; }\n")
+
+    assert BuildState(tmp_path, "many").dirty_files("key", files) == {edited}
+
+
+def test_run_drains_large_output(tmp_path):
+    """Megabytes of diagnostics on both pipes are captured without stalling the child."""
+    script = "import sys; sys.stdout.write('o' * 2**20); sys.stderr.write('e' * 2**20); sys.exit(3)"
+    result = _run([sys.executable, "-c", script], tmp_path, dict(os.environ))
+
+    assert result.returncode == 3
+    assert len(result.stdout) == 2**20 and len(result.stderr) == 2**20
+
+
+def test_same_tick_rewrite_is_rebuilt(project, fake_toolchains, fake_compiler):
+    """An edit that keeps the size and (on a coarse clock) the mtime is still rebuilt."""
+    source = project.root_path / "main.cpp"
+    build_project(project, fake_toolchains)
+    st = source.stat()
+
+    # Rewrite immediately with the same length and pin the old mtime, as a
+    # filesystem with 1-2s timestamp granularity would
+    source.write_text("int main() { return 7; }\n")
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    result = build_project(project, fake_toolchains)
+    assert result.skipped is False
+    assert fake_compiler.call_count == 2
+
+
+def test_same_named_sources_get_separate_objects(project, fake_toolchains, fake_compiler):
+    """util.cpp in two folders compiles to two object files, and both are linked."""
+    root = project.root_path
+    for folder in ("a", "b"):
+        (root / folder).mkdir()
+        (root / folder / "util.cpp").write_text(f"int {folder}_util() {{ return 1; }}\n")
+    project.files = [Path("main.cpp"), Path("a/util.cpp"), Path("b/util.cpp")]
+
+    result = build_project(project, fake_toolchains)
+
+    assert result.success
+    objects = [Path(p) for p in result.command if p.endswith(".o")]
+    assert len(set(objects)) == 3
+    assert all(obj.exists() for obj in objects)
+
+
+def test_standalone_build_keeps_state_out_of_the_source_folder(tmp_path, fake_toolchains, fake_compiler, monkeypatch):
+    """A lone .cpp doesn't get a .cpplab folder next to it; its state lives under ~/.cpplab."""
+    home = tmp_path / "home"
+    monkeypatch.setattr(Path, "home", lambda: home)
+    folder = tmp_path / "scratch"
+    folder.mkdir()
+    source = folder / "hello.cpp"
+    source.write_text("int main() { return 0; }\n")
+
+    assert build_single_file(source, fake_toolchains).success
+    assert build_single_file(source, fake_toolchains).skipped
+
+    assert not (folder / ".cpplab").exists()
+    assert list(home.glob(".cpplab/standalone/*/build_state.json"))
@@ -1,9 +1,8 @@
 # Tests for build command generation (without actual compilation).
 
-import pytest
 from pathlib import Path
 from unittest.mock import patch
-from src.cpplab.core.builder import build_command, project_config_for_single_file
+from src.cpplab.core.builder import build_command, check_command, project_config_for_single_file
 from src.cpplab.core.project_config import ProjectConfig
 from src.cpplab.core.toolchains import ToolchainConfig, select_toolchain
 
@@ -24,37 +23,6 @@ def _make_config(name, language="cpp", standard="c++17", project_type="console",
     )
 
 
-@pytest.fixture
-def fake_toolchain_mingw64():
-    """Fake mingw64 toolchain."""
-    return ToolchainConfig(
-        name="mingw64",
-        root_dir=Path("/fake/compilers/mingw64"),
-        is_32bit=False,
-        supports_openmp=True
-    )
-
-
-@pytest.fixture
-def fake_toolchain_mingw32():
-    """Fake mingw32 toolchain."""
-    return ToolchainConfig(
-        name="mingw32",
-        root_dir=Path("/fake/compilers/mingw32"),
-        is_32bit=True,
-        supports_openmp=False
-    )
-
-
-@pytest.fixture
-def fake_toolchains(fake_toolchain_mingw32, fake_toolchain_mingw64):
-    """Dictionary of fake toolchains."""
-    return {
-        "mingw32": fake_toolchain_mingw32,
-        "mingw64": fake_toolchain_mingw64
-    }
-
-
 def test_console_cpp17_command(fake_toolchains):
     """Console C++17 project generates correct command."""
     config = _make_config("TestConsole", standard="c++17")
@@ -121,6 +89,20 @@ def test_openmp_project_command(fake_toolchains):
         assert "-fopenmp" in cmd
 
 
+def test_check_command_is_syntax_only(fake_toolchains):
+    """Syntax check stops after the frontend: no object files, no link."""
+    config = _make_config("TestCheck")
+    
+    with patch.object(ToolchainConfig, 'is_available', return_value=True):
+        toolchain = select_toolchain(config, fake_toolchains)
+        cmd = check_command(config, toolchain)
+        
+        assert "-fsyntax-only" in cmd
+        assert "-std=c++17" in cmd
+        assert "-o" not in cmd
+        assert "-c" not in cmd
+
+
 def test_single_file_c_config():
     """Standalone .c file creates C17 config."""
     source_path = Path("/fake/test.c")
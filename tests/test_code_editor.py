@@ -0,0 +1,42 @@
+# Tests for the code editor's syntax highlighter.
+
+from PyQt6.QtGui import QTextDocument
+
+from src.cpplab.widgets.code_editor import FastSyntaxHighlighter
+
+
+def _highlight(source):
+    document = QTextDocument()
+    highlighter = FastSyntaxHighlighter(document)
+    document.setPlainText(source)
+    highlighter.rehighlight()
+    return document, highlighter
+
+
+def _is_comment(block, column):
+    for fmt_range in block.layout().formats():
+        if fmt_range.start <= column < fmt_range.start + fmt_range.length:
+            return fmt_range.format.fontItalic()
+    return False
+
+
+def test_block_comment_spans_lines(qapp):
+    """An unterminated /* keeps following lines greyed until the closing */."""
+    document, _ = _highlight("int a; /* start\nstill comment\nend */ int b;")
+    states = [document.findBlockByNumber(n).userState() for n in range(3)]
+
+    assert states == [FastSyntaxHighlighter.IN_COMMENT, FastSyntaxHighlighter.IN_COMMENT, 0]
+    assert _is_comment(document.findBlockByNumber(1), 0)
+    assert not _is_comment(document.findBlockByNumber(2), len("end */ i"))
+
+
+def test_comment_markers_inside_strings_are_ignored(qapp):
+    """A "/*" or "//" inside a string literal doesn't start a comment."""
+    document, _ = _highlight('const char* g = "src/*.cpp";\nint x;\nauto u = "http://x"; // real')
+    states = [document.findBlockByNumber(n).userState() for n in range(3)]
+
+    assert states == [0, 0, 0]
+    assert not _is_comment(document.findBlockByNumber(1), 0)
+    third = document.findBlockByNumber(2)
+    assert not _is_comment(third, third.text().index("http"))
+    assert _is_comment(third, third.text().index("real"))
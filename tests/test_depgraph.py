@@ -0,0 +1,73 @@
+# Tests for the #include "..." dependency graph.
+
+import os
+from pathlib import Path
+from src.cpplab.core.depgraph import (
+    scan_includes, build_graph, affected_sources, load_graph_cache, save_graph_cache
+)
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def test_scan_includes_resolves_quoted_includes(tmp_path):
+    """Quoted includes resolve next to the source; system and missing ones are skipped."""
+    header = _write(tmp_path / "src" / "util.h", "int util();\n")
+    main = _write(tmp_path / "src" / "main.cpp",
+                  '#include <iostream>\n  #  include "util.h"\n#include "missing.h"\n')
+
+    assert scan_includes(main) == [header]
+
+
+def test_scan_includes_uses_include_dirs(tmp_path):
+    """Includes not found beside the source are looked up in include_dirs."""
+    header = _write(tmp_path / "include" / "api.h", "")
+    main = _write(tmp_path / "src" / "main.cpp", '#include "api.h"\n')
+
+    assert scan_includes(main, [tmp_path / "include"]) == [header]
+
+
+def test_build_graph_follows_transitive_includes(tmp_path):
+    a = _write(tmp_path / "a.h", '#include "b.h"\n')
+    b = _write(tmp_path / "b.h", "")
+    main = _write(tmp_path / "main.cpp", '#include "a.h"\n')
+
+    graph = build_graph([main])
+
+    assert graph == {main: {a}, a: {b}, b: set()}
+
+
+def test_build_graph_reuses_cache_for_unchanged_files(tmp_path):
+    """Cached edges are used while a file's mtime and size are unchanged."""
+    main = _write(tmp_path / "main.cpp", '#include "a.h"\n')
+    _write(tmp_path / "a.h", "")
+    cache = {}
+    build_graph([main], cache=cache)
+    save_graph_cache(tmp_path, cache)
+
+    # Poison the cached edges; an unchanged file must not be re-scanned
+    cache = load_graph_cache(tmp_path)
+    cache[str(main)]["includes"] = []
+    assert build_graph([main], cache=cache) == {main: set()}
+
+    # Once the file changes it is scanned again
+    _write(main, '#include "a.h"\n\n')
+    st = main.stat()
+    os.utime(main, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert build_graph([main], cache=cache)[main] == {tmp_path / "a.h"}
+
+
+def test_affected_sources_walks_reverse_edges(tmp_path):
+    common = tmp_path / "common.h"
+    a_h = tmp_path / "a.h"
+    a = tmp_path / "a.cpp"
+    b = tmp_path / "b.cpp"
+    graph = {a: {a_h}, a_h: {common}, b: {common}, common: set()}
+
+    assert affected_sources(graph, [a, b], {a_h}) == {a}
+    assert affected_sources(graph, [a, b], {common}) == {a, b}
+    assert affected_sources(graph, [a, b], {b}) == {b}
+    assert affected_sources(graph, [a, b], set()) == set()
@@ -1,101 +1,145 @@
 """Tests for auto-detection of graphics.h and OpenMP in standalone files."""
 
-from pathlib import Path
-import tempfile
-import shutil
-from src.cpplab.core.builder import detect_features_from_source, project_config_for_single_file
+import subprocess
+from unittest.mock import patch
+from src.cpplab.core.builder import (
+    detect_features_from_source, detect_features_project, project_config_for_single_file
+)
 
 
 def test_detect_graphics_from_source():
     """Test detection of graphics.h include."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_file = Path(tmpdir) / "test.cpp"
-        test_file.write_text("""#include <graphics.h>
+    source = b"""#include <graphics.h>
 int main() {
     initgraph();
     return 0;
 }
-""")
-        features = detect_features_from_source(test_file)
-        assert features["graphics"] == True
-        assert features["openmp"] == False
+"""
+    features = detect_features_from_source(source)
+    assert features["graphics"] == True
+    assert features["openmp"] == False
 
 
 def test_detect_openmp_from_source():
     """Test detection of OpenMP pragma."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_file = Path(tmpdir) / "test.cpp"
-        test_file.write_text("""#include <iostream>
+    source = b"""#include <iostream>
 #pragma omp parallel
 int main() {
     return 0;
 }
-""")
-        features = detect_features_from_source(test_file)
-        assert features["graphics"] == False
-        assert features["openmp"] == True
+"""
+    features = detect_features_from_source(source)
+    assert features["graphics"] == False
+    assert features["openmp"] == True
 
 
 def test_detect_both_features():
     """Test detection of both graphics.h and OpenMP."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_file = Path(tmpdir) / "test.cpp"
-        test_file.write_text("""#include <graphics.h>
+    source = b"""#include <graphics.h>
 #pragma omp parallel
 int main() {
     return 0;
 }
-""")
-        features = detect_features_from_source(test_file)
-        assert features["graphics"] == True
-        assert features["openmp"] == True
+"""
+    features = detect_features_from_source(source)
+    assert features["graphics"] == True
+    assert features["openmp"] == True
 
 
 def test_detect_no_features():
     """Test detection when no special features are used."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_file = Path(tmpdir) / "test.cpp"
-        test_file.write_text("""#include <iostream>
+    source = b"""#include <iostream>
 int main() {
     return 0;
 }
-""")
-        features = detect_features_from_source(test_file)
-        assert features["graphics"] == False
-        assert features["openmp"] == False
+"""
+    features = detect_features_from_source(source)
+    assert features["graphics"] == False
+    assert features["openmp"] == False
+
+
+def test_detect_features_sees_file_changes(scratch_dir, request):
+    """Cached detection results are invalidated when the file changes."""
+    test_file = scratch_dir / f"{request.node.name}.cpp"
+    test_file.write_text("int main() { return 0; }\n")
+    assert detect_features_from_source(test_file)["openmp"] == False
+    
+    test_file.write_text("#pragma omp parallel\nint main() { return 0; }\n")
+    assert detect_features_from_source(test_file)["openmp"] == True
 
 
-def test_single_file_config_with_graphics():
+def test_single_file_config_with_graphics(scratch_dir, request):
     """Test that single file config includes detected graphics feature."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_file = Path(tmpdir) / "graphics.cpp"
-        test_file.write_text("""#include <graphics.h>
+    test_file = scratch_dir / f"{request.node.name}.cpp"
+    test_file.write_text("""#include <graphics.h>
 int main() { return 0; }
 """)
-        config = project_config_for_single_file(test_file)
-        assert config.features["graphics"] == True
-        assert config.features["openmp"] == False
+    config = project_config_for_single_file(test_file)
+    assert config.features["graphics"] == True
+    assert config.features["openmp"] == False
 
 
-def test_single_file_config_with_openmp():
+def test_single_file_config_with_openmp(scratch_dir, request):
     """Test that single file config includes detected OpenMP feature."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_file = Path(tmpdir) / "openmp.cpp"
-        test_file.write_text("""#pragma omp parallel
+    test_file = scratch_dir / f"{request.node.name}.cpp"
+    test_file.write_text("""#pragma omp parallel
 int main() { return 0; }
 """)
-        config = project_config_for_single_file(test_file)
-        assert config.features["graphics"] == False
-        assert config.features["openmp"] == True
+    config = project_config_for_single_file(test_file)
+    assert config.features["graphics"] == False
+    assert config.features["openmp"] == True
 
 
-def test_single_file_config_no_features():
+def test_single_file_config_no_features(scratch_dir, request):
     """Test that single file config has no features when none detected."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_file = Path(tmpdir) / "normal.cpp"
-        test_file.write_text("""#include <iostream>
+    test_file = scratch_dir / f"{request.node.name}.cpp"
+    test_file.write_text("""#include <iostream>
 int main() { return 0; }
 """)
-        config = project_config_for_single_file(test_file)
-        assert config.features["graphics"] == False
-        assert config.features["openmp"] == False
+    config = project_config_for_single_file(test_file)
+    assert config.features["graphics"] == False
+    assert config.features["openmp"] == False
+
+
+def _make_tree(root):
+    (root / "src").mkdir()
+    (root / ".cpplab").mkdir()
+    (root / "src" / "draw.cpp").write_text("#include <graphics.h>\n")
+    (root / "src" / "par.c").write_text("  #pragma omp parallel for\n")
+    (root / "src" / "plain.h").write_text("int f();\n")
+    (root / "notes.txt").write_text("#pragma omp parallel\n")
+    (root / ".cpplab" / "hidden.cpp").write_text("#include <graphics.h>\n")
+
+
+def test_detect_features_project_without_ripgrep(tmp_path):
+    """Without rg every source under the root is scanned in Python."""
+    _make_tree(tmp_path)
+    
+    with patch('src.cpplab.core.builder.shutil.which', return_value=None):
+        features = detect_features_project(tmp_path)
+    
+    assert features == {
+        tmp_path / "src" / "draw.cpp": {"graphics": True, "openmp": False},
+        tmp_path / "src" / "par.c": {"graphics": False, "openmp": True},
+        tmp_path / "src" / "plain.h": {"graphics": False, "openmp": False},
+    }
+
+
+def test_detect_features_project_uses_ripgrep_listing(tmp_path):
+    """rg's NUL-separated file lists are mapped back onto the source tree."""
+    _make_tree(tmp_path)
+    draw = tmp_path / "src" / "draw.cpp"
+    par = tmp_path / "src" / "par.c"
+    
+    def fake_rg(cmd, **kwargs):
+        hit = draw if "graphics" in cmd[-2] else par
+        return subprocess.CompletedProcess(cmd, 0, bytes(hit) + b"\0", b"")
+    
+    with patch('src.cpplab.core.builder.shutil.which', return_value="rg"), \
+         patch('src.cpplab.core.builder.subprocess.run', side_effect=fake_rg) as run:
+        features = detect_features_project(tmp_path)
+    
+    assert run.call_count == 2
+    assert features[draw] == {"graphics": True, "openmp": False}
+    assert features[par] == {"graphics": False, "openmp": True}
+    assert features[tmp_path / "src" / "plain.h"] == {"graphics": False, "openmp": False}
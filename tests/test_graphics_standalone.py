@@ -3,7 +3,7 @@
 from pathlib import Path
 from src.cpplab.core.toolchains import get_toolchains
 from src.cpplab.core.builder import build_single_file, detect_features_from_source
-import shutil
+from tests._cleanup import async_rmtree
 
 # Get toolchains
 toolchains = get_toolchains()
@@ -161,5 +161,5 @@ if result.command:
 print("\n" + "=" * 70)
 print("Cleaning up...")
 if test_dir.exists():
-    shutil.rmtree(test_dir)
+    async_rmtree(test_dir)
 print("✓ All tests passed!")
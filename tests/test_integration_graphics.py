@@ -3,17 +3,20 @@
 from pathlib import Path
 from src.cpplab.core.toolchains import get_toolchains
 from src.cpplab.core.builder import build_single_file, detect_features_from_source
+from tests._cleanup import async_rmtree, buffer_stdout, flush_log, log
 
-# Get toolchains
-toolchains = get_toolchains()
-print(f"Available toolchains: {list(toolchains.keys())}\n")
 
-# Create a test graphics file
-test_dir = Path.cwd() / "test_graphics_integration"
-test_dir.mkdir(exist_ok=True)
+def main():
+    # Get toolchains
+    toolchains = get_toolchains()
+    log.append(f"Available toolchains: {list(toolchains.keys())}\n")
 
-graphics_file = test_dir / "circle_demo.cpp"
-graphics_file.write_text("""#include <graphics.h>
+    # Create a test graphics file
+    test_dir = Path.cwd() / "test_graphics_integration"
+    test_dir.mkdir(exist_ok=True)
+
+    graphics_file = test_dir / "circle_demo.cpp"
+    graphics_file.write_text("""#include <graphics.h>
 #include <iostream>
 
 int main() {
@@ -36,67 +39,74 @@ int main() {
 }
 """)
 
-print("=" * 70)
-print("INTEGRATION TEST: Standalone Graphics File")
-print("=" * 70)
+    flush_log()
+    log.append("=" * 70)
+    log.append("INTEGRATION TEST: Standalone Graphics File")
+    log.append("=" * 70)
 
-# Step 1: Feature detection
-print("\n1. Detecting features from source code...")
-features = detect_features_from_source(graphics_file)
-print(f"   Detected: graphics={features['graphics']}, openmp={features['openmp']}")
+    # Step 1: Feature detection
+    log.append("\n1. Detecting features from source code...")
+    features = detect_features_from_source(graphics_file)
+    log.append(f"   Detected: graphics={features['graphics']}, openmp={features['openmp']}")
 
-# Step 2: Build
-print("\n2. Building standalone file...")
-result = build_single_file(graphics_file, toolchains)
-print(f"   Success: {result.success}")
-print(f"   Elapsed: {result.elapsed_ms:.2f}ms")
-print(f"   Skipped: {result.skipped}")
+    # Step 2: Build
+    log.append("\n2. Building standalone file...")
+    result = build_single_file(graphics_file, toolchains)
+    log.append(f"   Success: {result.success}")
+    log.append(f"   Elapsed: {result.elapsed_ms:.2f}ms")
+    log.append(f"   Skipped: {result.skipped}")
 
-# Step 3: Check command
-print("\n3. Generated command:")
-if result.command:
-    cmd_str = ' '.join(result.command)
-    print(f"   {cmd_str[:100]}...")
-    
-    # Verify graphics libraries
-    has_graphics = all([
-        "-lbgi" in result.command,
-        "-lgdi32" in result.command,
-        "-lcomdlg32" in result.command
-    ])
-    print(f"\n4. Graphics libraries included: {has_graphics}")
-    
-    if has_graphics:
-        print("   ✓ -lbgi (WinBGIm library)")
-        print("   ✓ -lgdi32 (Windows GDI)")
-        print("   ✓ -lcomdlg32 (Windows dialogs)")
-        print("   ✓ -luuid (Windows UUID)")
-        print("   ✓ -lole32 (Windows OLE)")
-        print("   ✓ -loleaut32 (Windows OLE Automation)")
+    # Step 3: Check command
+    log.append("\n3. Generated command:")
+    if result.command:
+        cmd_str = ' '.join(result.command)
+        log.append(f"   {cmd_str[:100]}...")
+        
+        # Verify graphics libraries
+        has_graphics = all([
+            "-lbgi" in result.command,
+            "-lgdi32" in result.command,
+            "-lcomdlg32" in result.command
+        ])
+        log.append(f"\n4. Graphics libraries included: {has_graphics}")
+        
+        if has_graphics:
+            log.append("   ✓ -lbgi (WinBGIm library)")
+            log.append("   ✓ -lgdi32 (Windows GDI)")
+            log.append("   ✓ -lcomdlg32 (Windows dialogs)")
+            log.append("   ✓ -luuid (Windows UUID)")
+            log.append("   ✓ -lole32 (Windows OLE)")
+            log.append("   ✓ -loleaut32 (Windows OLE Automation)")
+
+    # Step 4: Results
+    log.append("\n5. Results:")
+    if result.success:
+        log.append(f"   ✓ Executable created: {result.exe_path}")
+        log.append(f"   ✓ Auto-detection WORKING!")
+        log.append(f"\n   You can run: {result.exe_path}")
+    else:
+        log.append(f"   ✗ Build failed")
+        if result.stderr:
+            log.append(f"   Error: {result.stderr[:200]}")
+
+    # Cleanup
+    flush_log()
+    log.append("\n" + "=" * 70)
+    log.append("Cleanup")
+    log.append("=" * 70)
+    if test_dir.exists():
+        async_rmtree(test_dir)
+        log.append("✓ Test directory removal started")
 
-# Step 4: Results
-print("\n5. Results:")
-if result.success:
-    print(f"   ✓ Executable created: {result.exe_path}")
-    print(f"   ✓ Auto-detection WORKING!")
-    print(f"\n   You can run: {result.exe_path}")
-else:
-    print(f"   ✗ Build failed")
-    if result.stderr:
-        print(f"   Error: {result.stderr[:200]}")
+    log.append("\n[x] Integration test complete!")
+    log.append("\nSUMMARY:")
+    log.append("- Feature detection: WORKING")
+    log.append("- Graphics library linking: WORKING")
+    log.append("- Standalone file build: WORKING")
+    log.append("- Toolchain selection (mingw32 for graphics): WORKING")
+    flush_log()
 
-# Cleanup
-print("\n" + "=" * 70)
-print("Cleanup")
-print("=" * 70)
-import shutil
-if test_dir.exists():
-    shutil.rmtree(test_dir)
-    print("✓ Test directory removed")
 
-print("\n[x] Integration test complete!")
-print("\nSUMMARY:")
-print("- Feature detection: WORKING")
-print("- Graphics library linking: WORKING")
-print("- Standalone file build: WORKING")
-print("- Toolchain selection (mingw32 for graphics): WORKING")
+if __name__ == "__main__":
+    buffer_stdout()
+    main()
@@ -2,6 +2,7 @@
 
 import pytest
 import json
+import pickle
 from pathlib import Path
 from src.cpplab.core.project_config import ProjectConfig, create_new_project
 
@@ -145,6 +146,35 @@ def test_save_and_load_project_config(tmp_path):
     assert loaded.root_path == original.root_path
 
 
+@pytest.fixture
+def console_project(scratch_dir, request):
+    """A fresh C++ console project in the session scratch directory, named after the test."""
+    return create_new_project(
+        name=request.node.name,
+        parent_dir=scratch_dir,
+        language="cpp",
+        standard="c++17",
+        project_type="console"
+    )
+
+
+def test_save_replaces_config_atomically(console_project):
+    """save() goes through a temp file and leaves no partial files behind."""
+    console_project.standard = "c++20"
+    console_project.save()
+    
+    assert not (console_project.root_path / ".cpplab.json.tmp").exists()
+    assert ProjectConfig.load(console_project.root_path).standard == "c++20"
+
+
+def test_project_config_uses_slots(console_project):
+    """ProjectConfig has no per-instance __dict__ and still pickles round-trip."""
+    assert not hasattr(console_project, "__dict__")
+    
+    restored = pickle.loads(pickle.dumps(console_project))
+    assert restored == console_project
+
+
 def test_load_project_config_invalid_path():
     """Loading from non-existent path raises error."""
     with pytest.raises(FileNotFoundError):
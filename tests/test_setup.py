@@ -3,6 +3,7 @@ Test script to verify project structure and imports
 Run this before attempting to launch the IDE
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -52,9 +53,22 @@ def test_structure():
         "src/cpplab/core/docs.py",
     ]
     
+    # One walk of the tree instead of a stat per required file
+    present = set()
+    pending = ["src/cpplab"]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    else:
+                        present.add(entry.path.replace(os.sep, "/"))
+        except OSError:
+            pass
+    
     for file_path in required_files:
-        full_path = Path(file_path)
-        if full_path.exists():
+        if file_path in present:
             print(f"  ✓ {file_path}")
         else:
             errors.append(f"  ✗ Missing: {file_path}")
@@ -4,17 +4,187 @@
 import os
 import sys
 import stat
+import struct
+import argparse
 import time
 import shutil
+import hashlib
 import subprocess
+import tarfile
+import tempfile
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
+
+try:
+    import zstandard  # Optional: enables the .tar.zst archive
+except ImportError:
+    zstandard = None
+
+try:
+    from compression import zstd as zip_zstd  # Python 3.14+: zstd members in the .zip
+except ImportError:
+    zip_zstd = None
 
 VERSION = "1.0.0"
 APP_NAME = "CppLabEngine"
 DIST_DIR = Path("dist")
 BUILD_DIR = Path("build")
 ROOT_DIR = Path(__file__).parent.parent
+# Compression for the .zip members. DEFLATE opens everywhere, so it is the
+# default; CPPLAB_ZIP_METHOD=zstd (Python 3.14+) is smaller and faster to
+# produce and extract but needs a zstd-aware reader such as a recent 7-Zip.
+ZIP_ZSTD = (os.environ.get("CPPLAB_ZIP_METHOD", "deflate") == "zstd"
+            and zip_zstd is not None and hasattr(zipfile, "ZIP_ZSTANDARD"))
+ZIP_METHOD = zipfile.ZIP_ZSTANDARD if ZIP_ZSTD else zipfile.ZIP_DEFLATED
+# The payload is mostly compiler binaries, where DEFLATE-9 is only
+# fractionally smaller than 6 but costs ~1.5-2x the CPU time; zstd-15 gets
+# most of zstd's maximum ratio at a fraction of the cost of 19+.
+ZIP_LEVEL = int(os.environ.get("CPPLAB_ZIP_LEVEL", "15" if ZIP_ZSTD else "6"))
+# zstd level for the .tar.zst; 19 beats DEFLATE-9 on size and still
+# decompresses several times faster than either .zip or .7z
+ZSTD_LEVEL = int(os.environ.get("CPPLAB_ZSTD_LEVEL", "19"))
+# Already entropy-coded formats: DEFLATE burns CPU on them for ~1% gain, so
+# they go into the .zip stored. (.exe/.dll are not here; MinGW binaries
+# still deflate to well under half their size.)
+STORED_SUFFIXES = frozenset({
+    '.png', '.jpg', '.jpeg', '.zip', '.7z', '.gz', '.zst', '.xz', '.woff', '.woff2'
+})
+
+# Stdlib/tooling modules the app never imports. PyInstaller's analysis would
+# otherwise trace into them and bundle them into _internal/.
+EXCLUDED_MODULES = (
+    "tkinter", "unittest", "test", "lib2to3", "pydoc_data", "xmlrpc",
+    "http.server", "distutils", "setuptools", "pip",
+)
+
+
+MANIFEST_PATH = DIST_DIR / ".build-manifest"
+
+# Placeholder license files for bundled components, encoded once at import
+_LICENSE_PLACEHOLDERS = (
+    ("MinGW_LICENSE.txt", (
+        "MinGW-w64 Compiler Collection\n"
+        "License: Multiple (GCC: GPL, Runtime: Public Domain/MIT)\n\n"
+        "This distribution includes MinGW-w64 compilers.\n"
+        "Full license information: https://www.mingw-w64.org/\n\n"
+        "GCC (GNU Compiler Collection) is licensed under GPL v3+\n"
+        "Runtime libraries are under runtime exception or more permissive licenses.\n"
+    ).encode()),
+    ("WinBGIm_LICENSE.txt", (
+        "WinBGIm - Windows BGI Implementation\n"
+        "License: BSD-style\n\n"
+        "WinBGIm is provided for educational purposes.\n"
+        "Original BGI graphics library by Borland.\n"
+        "Windows port by various contributors.\n\n"
+        "For more information: http://www.cs.colorado.edu/~main/cs1300/doc/bgi/\n"
+    ).encode()),
+    ("PyQt6_LICENSE.txt", (
+        "PyQt6 - Python bindings for Qt6\n"
+        "License: GPL v3 / Commercial\n\n"
+        "This application uses PyQt6 under the GPL v3 license.\n"
+        "PyQt6 is developed by Riverbank Computing Limited.\n\n"
+        "Qt6 is licensed under LGPL v3 / Commercial by The Qt Company.\n\n"
+        "For more information:\n"
+        "  PyQt: https://riverbankcomputing.com/software/pyqt/\n"
+        "  Qt: https://www.qt.io/licensing/\n"
+    ).encode()),
+)
+
+
+def input_digest(link: bool = False) -> str:
+    """Hash everything the release is built from.
+
+    Sources, UI files, docs, LICENSE and this script are hashed by content.
+    The compilers tree is hundreds of MB that almost never changes, so it is
+    hashed by path, size and mtime only. Settings and tools outside the tree
+    that change the output (signing, 7-Zip, zstandard, --link) are included
+    via _environment_inputs().
+    """
+    h = hashlib.sha256()
+    h.update(f"{VERSION}\0{ZIP_METHOD}\0{ZIP_LEVEL}\0{ZSTD_LEVEL}\0".encode())
+    h.update(_environment_inputs(link).encode() + b"\0")
+    
+    content_files = []
+    for root in (ROOT_DIR / "src", ROOT_DIR / "docs_source"):
+        content_files.extend(
+            p for p in root.rglob('*') if p.is_file() and "__pycache__" not in p.parts
+        )
+    content_files.extend(p for p in (ROOT_DIR / "LICENSE", Path(__file__).resolve()) if p.exists())
+    for path in sorted(content_files):
+        h.update(str(path.relative_to(ROOT_DIR)).encode() + b"\0")
+        h.update(path.read_bytes())
+    
+    h.update(compilers_digest().encode())
+    return h.hexdigest()
+
+
+def _environment_inputs(link: bool) -> str:
+    """Describe the non-source inputs of a build, so changing any of them forces a rebuild."""
+    pfx = os.environ.get("SIGN_PFX", "")
+    pfx_stamp = ""
+    if pfx and os.path.isfile(pfx):
+        st = os.stat(pfx)
+        pfx_stamp = f"{st.st_size}:{st.st_mtime_ns}"
+    signers = [name for name in ("signtool", "osslsigncode", "gpg") if shutil.which(name)]
+    return "\0".join([
+        f"link={link}",
+        f"7z={_find_7z() is not None}",
+        f"zstandard={zstandard is not None}",
+        f"pfx={pfx}:{pfx_stamp}",
+        # Only whether a password is set; the digest is written to disk
+        f"pfx_password={bool(os.environ.get('SIGN_PFX_PASSWORD'))}",
+        f"timestamp={os.environ.get('SIGN_TIMESTAMP_URL', '')}",
+        f"gpg_key={os.environ.get('SIGN_GPG_KEY', '')}",
+        f"signers={','.join(signers)}",
+    ])
+
+
+def compilers_digest() -> str:
+    """Hash compilers/ by path, size and mtime (cheap; it's hundreds of MB)."""
+    h = hashlib.sha256()
+    compilers = ROOT_DIR / "compilers"
+    if compilers.exists():
+        for entry in sorted(_walk_files(compilers), key=lambda e: e.path):
+            st = entry.stat()
+            h.update(f"{os.path.relpath(entry.path, ROOT_DIR)}\0{st.st_size}\0{st.st_mtime_ns}\0".encode())
+    return h.hexdigest()
+
+
+def _walk_files(root, skip=()):
+    """Yield os.DirEntry for every regular file under root (iterative scandir walk).
+
+    DirEntry.is_dir()/is_file() come from the directory listing itself, so
+    unlike rglob('*') + Path.is_file() this costs no extra stat per file.
+    Directories whose path is in `skip` are not descended into.
+    """
+    skip = {os.fspath(d) for d in skip}
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in skip:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def is_up_to_date(digest: str) -> bool:
+    """True if dist/ was built from exactly these inputs and its outputs still exist."""
+    outputs = [
+        DIST_DIR / APP_NAME / f"{APP_NAME}.exe",
+        DIST_DIR / f"{APP_NAME}-v{VERSION}-windows-x64.zip",
+    ]
+    try:
+        return MANIFEST_PATH.read_text(encoding='utf-8').strip() == digest and all(
+            p.exists() for p in outputs
+        )
+    except OSError:
+        return False
 
 
 def print_step(step_num, total, message):
@@ -24,8 +194,45 @@ def print_step(step_num, total, message):
     print(f"{'='*70}\n")
 
 
-def clean_build():
-    """Remove previous build artifacts."""
+def _tmpfs_mounts():
+    """Mount points of tmpfs filesystems (Linux only; empty elsewhere)."""
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            return [fields[1] for fields in (line.split() for line in f) if fields[2] == "tmpfs"]
+    except OSError:
+        return []
+
+
+def pyinstaller_workpath():
+    """Where PyInstaller should put its work files, or None for the default build/.
+
+    The work tree is thousands of small intermediate files that are never
+    shipped, so it goes on a RAM disk when one is available: CPPLAB_WORKPATH
+    if set (e.g. a folder on a Windows RAM disk), else a tmpfs-backed temp
+    dir (Linux CI). The temp dir is shared, so the folder name is unique to
+    this user and checkout; concurrent builds never share (or --full-delete)
+    each other's work files.
+    """
+    override = os.environ.get("CPPLAB_WORKPATH")
+    if override:
+        return Path(override)
+    
+    tempdir = os.path.realpath(tempfile.gettempdir())
+    if any(tempdir == m or tempdir.startswith(m.rstrip("/") + "/") for m in _tmpfs_mounts()):
+        checkout = hashlib.sha256(str(ROOT_DIR.resolve()).encode()).hexdigest()[:12]
+        # tmpfs detection is Linux-only, so os.getuid() is available here
+        return Path(tempdir) / f"cpplab_work-{os.getuid()}-{checkout}"
+    
+    return None
+
+
+def clean_build(full: bool = False):
+    """Remove previous build artifacts.
+
+    dist/ is always cleared so the archives only contain this build.
+    PyInstaller's build/ work directory is kept between runs (its cache is
+    what makes incremental rebuilds fast) unless a full build is requested.
+    """
     print_step(1, 8, "Cleaning previous builds")
     
     def _on_rm_error(func, path, exc_info):
@@ -74,7 +281,9 @@ def clean_build():
                         f"Failed to remove {path!s}. Close any running programs using files inside and retry, or remove the folder manually. Original error: {exc}"
                     )
 
-    for path in [DIST_DIR, BUILD_DIR]:
+    workpath = pyinstaller_workpath()
+    stale = [DIST_DIR, BUILD_DIR, *([workpath] if workpath else [])] if full else [DIST_DIR]
+    for path in stale:
         if path.exists():
             print(f"  Removing {path}/")
             _rm_tree_force(path)
@@ -87,35 +296,96 @@ def clean_build():
     print("  Clean complete ✓")
 
 
-def run_pyinstaller():
+def run_pyinstaller(full: bool = False):
     """Build executable with PyInstaller."""
     print_step(2, 8, "Building executable with PyInstaller")
     
-    cmd = [
-        sys.executable, "-m", "PyInstaller",
+    # Run in-process rather than via `python -m PyInstaller`: saves a second
+    # interpreter start-up. Imported here so up-to-date runs never pay for it.
+    try:
+        from PyInstaller.__main__ import run as pyinstaller_run
+    except ImportError:
+        print("\n  ERROR: PyInstaller is not installed (pip install pyinstaller)")
+        sys.exit(1)
+    
+    workpath = pyinstaller_workpath()
+    args = [
         "--noconfirm",
-        "--clean",
+        *(["--clean"] if full else []),
         "--name", APP_NAME,
+        *(["--workpath", str(workpath)] if workpath else []),
         "--onedir",
         "--windowed",
         "--add-data", "src/cpplab/ui;cpplab/ui",
         "--add-data", "src/cpplab/resources;cpplab/resources",
         "--add-data", "docs_source;docs_source",
+        *(arg for module in EXCLUDED_MODULES for arg in ("--exclude-module", module)),
         "src/cpplab/main.py"
     ]
     
-    print(f"  Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=ROOT_DIR)
+    print(f"  Running: pyinstaller {' '.join(args)}")
+    # PyInstaller resolves the relative paths above against the cwd
+    cwd = os.getcwd()
+    os.chdir(ROOT_DIR)
+    try:
+        pyinstaller_run(args)
+        failed = False
+    except SystemExit as e:
+        # PyInstaller reports errors by exiting
+        failed = e.code not in (None, 0)
+    except Exception as e:
+        print(f"\n  {type(e).__name__}: {e}")
+        failed = True
+    finally:
+        os.chdir(cwd)
     
-    if result.returncode != 0:
+    if failed:
         print("\n  ERROR: PyInstaller failed!")
         sys.exit(1)
     
     print("  Executable built ✓")
 
 
-def copy_resources():
-    """Copy compilers, examples, and licenses to distribution."""
+def _copy_file(src, dst, link: bool = False) -> int:
+    """Copy one file with metadata; returns its size for reporting.
+
+    With link=True the file is hard-linked instead, falling back to a copy
+    when that isn't possible (different volume, FAT, ...).
+    """
+    if link:
+        try:
+            os.link(src, dst)
+            return os.stat(dst).st_size
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return os.stat(dst).st_size
+
+
+def _copy_tree_parallel(src: Path, dst: Path, max_workers: int = 8, link: bool = False) -> int:
+    """Copy a directory tree with per-file copies spread over a thread pool.
+
+    The compilers tree is thousands of small files, where per-file
+    open/close latency (plus antivirus scanning on Windows) dominates;
+    running the copies concurrently overlaps it. Returns total bytes copied.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = []
+        for dirpath, _dirnames, filenames in os.walk(src):
+            target_dir = dst / os.path.relpath(dirpath, src)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for name in filenames:
+                futures.append(pool.submit(_copy_file, os.path.join(dirpath, name), target_dir / name, link))
+        # result() re-raises any copy error here
+        return sum(f.result() for f in futures)
+
+
+def copy_resources(link: bool = False):
+    """Copy compilers, examples, and licenses to distribution.
+
+    With link=True the compilers are hard-linked into dist/ rather than
+    copied; the staged files are never modified, so sharing them is safe.
+    """
     print_step(3, 8, "Copying resources")
     
     dist_root = DIST_DIR / APP_NAME
@@ -124,12 +394,12 @@ def copy_resources():
     compilers_src = ROOT_DIR / "compilers"
     compilers_dst = dist_root / "compilers"
     if compilers_src.exists():
-        print(f"  Copying compilers")
+        print(f"  {'Linking' if link else 'Copying'} compilers")
         #going back to previous method of copying without ignoring patterns
-        shutil.copytree(compilers_src, compilers_dst, dirs_exist_ok=True)
+        copied = _copy_tree_parallel(compilers_src, compilers_dst, link=link)
         
         # Report size savings
-        size_mb = sum(f.stat().st_size for f in compilers_dst.rglob('*') if f.is_file()) / (1024 * 1024)
+        size_mb = copied / (1024 * 1024)
         print(f"  Compilers copied: {size_mb:.1f} MB")
     else:
         print("  WARNING: compilers/ not found (required for distribution!)")
@@ -139,7 +409,7 @@ def copy_resources():
     #examples_dst = dist_root / "examples"
     #if examples_src.exists():
     #    print(f"  Copying examples/")
-    #    shutil.copytree(examples_src, examples_dst, dirs_exist_ok=True)
+    #    _copy_tree_parallel(examples_src, examples_dst)
     #else:
         #print("  WARNING: examples/ not found (skipping)")
     
@@ -156,34 +426,12 @@ def copy_resources():
     # Create placeholder license files for bundled components
     print("  Creating license placeholders")
     
-    (licenses_dst / "MinGW_LICENSE.txt").write_text(
-        "MinGW-w64 Compiler Collection\n"
-        "License: Multiple (GCC: GPL, Runtime: Public Domain/MIT)\n\n"
-        "This distribution includes MinGW-w64 compilers.\n"
-        "Full license information: https://www.mingw-w64.org/\n\n"
-        "GCC (GNU Compiler Collection) is licensed under GPL v3+\n"
-        "Runtime libraries are under runtime exception or more permissive licenses.\n"
-    )
-    
-    (licenses_dst / "WinBGIm_LICENSE.txt").write_text(
-        "WinBGIm - Windows BGI Implementation\n"
-        "License: BSD-style\n\n"
-        "WinBGIm is provided for educational purposes.\n"
-        "Original BGI graphics library by Borland.\n"
-        "Windows port by various contributors.\n\n"
-        "For more information: http://www.cs.colorado.edu/~main/cs1300/doc/bgi/\n"
-    )
-    
-    (licenses_dst / "PyQt6_LICENSE.txt").write_text(
-        "PyQt6 - Python bindings for Qt6\n"
-        "License: GPL v3 / Commercial\n\n"
-        "This application uses PyQt6 under the GPL v3 license.\n"
-        "PyQt6 is developed by Riverbank Computing Limited.\n\n"
-        "Qt6 is licensed under LGPL v3 / Commercial by The Qt Company.\n\n"
-        "For more information:\n"
-        "  PyQt: https://riverbankcomputing.com/software/pyqt/\n"
-        "  Qt: https://www.qt.io/licensing/\n"
-    )
+    for name, text in _LICENSE_PLACEHOLDERS:
+        fd = os.open(licenses_dst / name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, text)
+        finally:
+            os.close(fd)
     
     print("  Resources copied ✓")
 
@@ -414,8 +662,247 @@ def sign_executable():
     print("  Note: Only Authenticode (PFX) signing removes 'Unknown publisher' warnings on Windows.")
 
 
+def _find_7z():
+    """Locate the 7-Zip command line tool, or return None."""
+    sevenz_cmd = shutil.which("7z")
+    if not sevenz_cmd:
+        # Try common installation paths
+        possible_paths = [
+            r"C:\Program Files\7-Zip\7z.exe",
+            r"C:\Program Files (x86)\7-Zip\7z.exe",
+        ]
+        for path in possible_paths:
+            if Path(path).exists():
+                sevenz_cmd = path
+                break
+    return sevenz_cmd
+
+
+def _zip_with_7z(sevenz_cmd, zip_path, dist_folder) -> bool:
+    """Build the .zip with 7-Zip's multi-threaded deflate encoder."""
+    result = subprocess.run(
+        [sevenz_cmd, "a", "-tzip", f"-mx={ZIP_LEVEL}", "-mmt=on",
+         str(zip_path.resolve()), str(dist_folder.resolve())],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(f"    ✗ 7z zip failed: {(result.stderr or result.stdout or '').strip()}")
+        if zip_path.exists():
+            zip_path.unlink()
+        return False
+    return True
+
+
+def _create_tar_zst(dist_folder: Path, tar_zst_path: Path):
+    """Stream a tar of dist_folder through a multi-threaded zstd compressor."""
+    cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+    with open(tar_zst_path, 'wb') as fh, cctx.stream_writer(fh) as compressor:
+        with tarfile.open(fileobj=compressor, mode='w|') as tar:
+            tar.add(dist_folder, arcname=dist_folder.name)
+
+
+# Spooled members above this size go to a temp file instead of memory
+_SPOOL_MAX = 8 * 1024 * 1024
+# Sizes/offsets past this need zip64 records (same threshold zipfile uses)
+_ZIP64_LIMIT = zipfile.ZIP64_LIMIT
+
+
+def _compress_member(file_path: str, compress_type: int):
+    """Read one file in 1 MiB blocks and compress it in zip's member format.
+
+    Runs on a worker thread; zlib and zstd release the GIL while compressing.
+    Output is spooled, so only small members stay in memory.
+    Returns (crc32, uncompressed size, compressed size, spool positioned at 0).
+    """
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(ZIP_LEVEL, zlib.DEFLATED, -15)  # raw deflate
+    elif compress_type != zipfile.ZIP_STORED:
+        compressor = zip_zstd.ZstdCompressor(ZIP_LEVEL)
+    else:
+        compressor = None
+    crc = size = 0
+    spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX)
+    with open(file_path, 'rb') as f:
+        while block := f.read(1024 * 1024):
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            spool.write(compressor.compress(block) if compressor else block)
+    if compressor:
+        spool.write(compressor.flush())
+    compressed_size = spool.tell()
+    spool.seek(0)
+    return crc, size, compressed_size, spool
+
+
+class _ZipWriter:
+    """Minimal zip writer for members compressed elsewhere.
+
+    zipfile only accepts data it compresses itself, on one core. This writes
+    the local headers, central directory and (when sizes or offsets need
+    them) zip64 records directly, so members can be compressed on a thread
+    pool or copied raw from another zip.
+    """
+    
+    def __init__(self, fp):
+        self._fp = fp
+        self._central = []  # Central directory records, in member order
+    
+    @staticmethod
+    def _dos_time(date_time):
+        year, month, day, hour, minute, second = date_time
+        return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+    
+    def add(self, zinfo, crc: int, size: int, compressed_size: int, src):
+        """Write one member; `src` is read from its current position for compressed_size bytes."""
+        offset = self._fp.tell()
+        try:
+            name, flags = zinfo.filename.encode('ascii'), 0
+        except UnicodeEncodeError:
+            name, flags = zinfo.filename.encode('utf-8'), 0x800
+        dostime, dosdate = self._dos_time(zinfo.date_time)
+        
+        zip64 = size > _ZIP64_LIMIT or compressed_size > _ZIP64_LIMIT
+        version = 20
+        if zip64:
+            version = 45
+        if zinfo.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            version = 63  # zstd members
+        
+        extra = struct.pack('<HHQQ', 1, 16, size, compressed_size) if zip64 else b''
+        self._fp.write(struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50, version, flags, zinfo.compress_type, dostime, dosdate,
+            crc, 0xFFFFFFFF if zip64 else compressed_size, 0xFFFFFFFF if zip64 else size,
+            len(name), len(extra)
+        ))
+        self._fp.write(name)
+        self._fp.write(extra)
+        remaining = compressed_size
+        while remaining:
+            block = src.read(min(remaining, 1024 * 1024))
+            if not block:
+                raise OSError(f"{zinfo.filename}: member data ended early")
+            self._fp.write(block)
+            remaining -= len(block)
+        
+        # The central record carries zip64 values only for the fields that overflow
+        fields = [v for v in (size, compressed_size, offset) if v > _ZIP64_LIMIT]
+        central_extra = struct.pack(f'<HH{len(fields)}Q', 1, 8 * len(fields), *fields) if fields else b''
+        self._central.append(struct.pack(
+            '<IHHHHHHIIIHHHHHII', 0x02014b50, (zinfo.create_system << 8) | version, version,
+            flags, zinfo.compress_type, dostime, dosdate, crc,
+            0xFFFFFFFF if compressed_size > _ZIP64_LIMIT else compressed_size,
+            0xFFFFFFFF if size > _ZIP64_LIMIT else size,
+            len(name), len(central_extra), 0, 0, 0, zinfo.external_attr,
+            0xFFFFFFFF if offset > _ZIP64_LIMIT else offset
+        ) + name + central_extra)
+    
+    def copy_from(self, zip_path: Path):
+        """Copy every member of an existing zip without recompressing it."""
+        with zipfile.ZipFile(zip_path) as source, open(zip_path, 'rb') as raw:
+            for zinfo in source.infolist():
+                # Skip the member's local header; its name/extra lengths can
+                # differ from the central directory's
+                raw.seek(zinfo.header_offset + 26)
+                name_len, extra_len = struct.unpack('<HH', raw.read(4))
+                raw.seek(name_len + extra_len, os.SEEK_CUR)
+                self.add(zinfo, zinfo.CRC, zinfo.file_size, zinfo.compress_size, raw)
+    
+    def close(self):
+        """Write the central directory and end records."""
+        cd_offset = self._fp.tell()
+        for record in self._central:
+            self._fp.write(record)
+        cd_size = self._fp.tell() - cd_offset
+        count = len(self._central)
+        
+        if count >= 0xFFFF or cd_size > _ZIP64_LIMIT or cd_offset > _ZIP64_LIMIT:
+            eocd64_offset = self._fp.tell()
+            self._fp.write(struct.pack(
+                '<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset
+            ))
+            self._fp.write(struct.pack('<IIQI', 0x07064b50, 0, eocd64_offset, 1))
+            count = min(count, 0xFFFF)
+            cd_size = min(cd_size, 0xFFFFFFFF)
+            cd_offset = min(cd_offset, 0xFFFFFFFF)
+        self._fp.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count, cd_size, cd_offset, 0))
+
+
+def _add_zip_members(writer: _ZipWriter, entries):
+    """Add dist files (DirEntry) to the zip under their path relative to dist/.
+
+    Members are compressed on a thread pool and written in order as they
+    complete. At most two members per worker are in flight, each holding
+    at most _SPOOL_MAX bytes in memory, so memory stays bounded however
+    large the files.
+    """
+    workers = os.cpu_count() or 4
+    # Entries come from _walk_files(DIST_DIR / ...), so every path starts
+    # with "dist/"; slicing it off avoids relpath's two getcwd() calls per file
+    prefix_len = len(os.fspath(DIST_DIR)) + 1
+    pending = deque()
+    
+    def write_next():
+        zinfo, future = pending.popleft()
+        crc, size, compressed_size, spool = future.result()
+        with spool:
+            writer.add(zinfo, crc, size, compressed_size, spool)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for entry in entries:
+            arc_name = entry.path[prefix_len:].replace('\\', '/')
+            zinfo = zipfile.ZipInfo.from_file(entry.path, arc_name)
+            if os.path.splitext(entry.name)[1].lower() in STORED_SUFFIXES:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            else:
+                zinfo.compress_type = ZIP_METHOD
+            pending.append((zinfo, pool.submit(_compress_member, entry.path, zinfo.compress_type)))
+            if len(pending) >= workers * 2:
+                write_next()
+        while pending:
+            write_next()
+
+
+def _write_zip(zip_path: Path, entries, copy_from: Optional[Path] = None):
+    """Write a zip of `entries`, after the members of `copy_from` if given."""
+    with open(zip_path, 'wb') as fp:
+        writer = _ZipWriter(fp)
+        if copy_from:
+            writer.copy_from(copy_from)
+        _add_zip_members(writer, entries)
+        writer.close()
+
+
+def prepare_compiler_blob():
+    """Return a zip of just dist's compilers/, compressing it only when it changed.
+
+    The toolchains are most of the archive and rarely change between
+    releases, so their compressed form is cached in build/compiler-blobs/,
+    keyed on compilers_digest(), ZIP_METHOD and ZIP_LEVEL (--full clears it
+    along with the rest of build/). Returns None when there are no compilers.
+    """
+    compilers_dst = DIST_DIR / APP_NAME / "compilers"
+    if not compilers_dst.exists():
+        return None
+    
+    cache_dir = BUILD_DIR / "compiler-blobs"
+    blob = cache_dir / f"compilers-{compilers_digest()[:16]}-{'zstd' if ZIP_ZSTD else 'deflate'}{ZIP_LEVEL}.zip"
+    if blob.exists():
+        print(f"    Reusing compressed compilers from {blob}")
+        return blob
+    
+    print("    Compressing compilers (cached for later builds)...")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for old in cache_dir.glob("compilers-*"):
+        old.unlink()
+    tmp = blob.with_suffix(".tmp")
+    _write_zip(tmp, sorted(_walk_files(compilers_dst), key=lambda e: e.path))
+    os.replace(tmp, blob)
+    return blob
+
+
 def create_archives():
-    """Create release archives (both .zip and .7z)."""
+    """Create release archives (.zip, plus .7z and .tar.zst when available)."""
     print_step(6, 8, "Creating release archives")
     
     dist_folder = DIST_DIR / APP_NAME
@@ -439,18 +926,25 @@ def create_archives():
     print(f"    Removed {removed_count} .pyc files ({removed_size / (1024*1024):.1f} MB)")
     
     # Create standard .zip (maximum compatibility)
-    print(f"\n  Creating .zip archive (standard compression)...")
+    print(f"\n  Creating .zip archive ({'zstd' if ZIP_ZSTD else 'deflate'} level {ZIP_LEVEL})...")
+    if os.environ.get("CPPLAB_ZIP_METHOD") == "zstd" and not ZIP_ZSTD:
+        print("    zstd zip members need Python 3.14+ — using deflate")
     zip_name = f"{APP_NAME}-v{VERSION}-windows-x64.zip"
     zip_path = DIST_DIR / zip_name
     
     if zip_path.exists():
         zip_path.unlink()
     
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
-        for file_path in dist_folder.rglob('*'):
-            if file_path.is_file():
-                arc_name = file_path.relative_to(DIST_DIR)
-                zf.write(file_path, arc_name)
+    sevenz_cmd = _find_7z()
+    compiler_blob = prepare_compiler_blob()
+    if compiler_blob:
+        # Copy the already-compressed compilers across raw, then add the rest
+        _write_zip(zip_path, _walk_files(dist_folder, skip=[dist_folder / "compilers"]), compiler_blob)
+    # 7-Zip deflates on every core (its zip writer has no zstd)
+    elif not ZIP_ZSTD and sevenz_cmd and _zip_with_7z(sevenz_cmd, zip_path, dist_folder):
+        print("    (multi-threaded via 7-Zip)")
+    else:
+        _write_zip(zip_path, _walk_files(dist_folder))
     
     zip_size_mb = zip_path.stat().st_size / (1024 * 1024)
     print(f"    ✓ {zip_path.name} ({zip_size_mb:.1f} MB)")
@@ -463,19 +957,6 @@ def create_archives():
     if sevenz_path.exists():
         sevenz_path.unlink()
     
-    # Try to use 7z command line
-    sevenz_cmd = shutil.which("7z")
-    if not sevenz_cmd:
-        # Try common installation paths
-        possible_paths = [
-            r"C:\Program Files\7-Zip\7z.exe",
-            r"C:\Program Files (x86)\7-Zip\7z.exe",
-        ]
-        for path in possible_paths:
-            if Path(path).exists():
-                sevenz_cmd = path
-                break
-    
     if sevenz_cmd:
         try:
             # Use absolute path for the source folder to avoid cwd-relative issues
@@ -501,6 +982,25 @@ def create_archives():
         print(f"    7-Zip not found (install from https://www.7-zip.org/)")
         print("    → Only .zip archive will be available")
     
+    # Create .tar.zst archive (best size/speed tradeoff, requires zstandard)
+    print(f"\n  Creating .tar.zst archive (zstd level {ZSTD_LEVEL})...")
+    tar_zst_path = DIST_DIR / f"{APP_NAME}-v{VERSION}-windows-x64.tar.zst"
+    
+    if tar_zst_path.exists():
+        tar_zst_path.unlink()
+    
+    if zstandard is not None:
+        try:
+            _create_tar_zst(dist_folder, tar_zst_path)
+            zst_size_mb = tar_zst_path.stat().st_size / (1024 * 1024)
+            print(f"    ✓ {tar_zst_path.name} ({zst_size_mb:.1f} MB)")
+        except Exception as e:
+            print(f"    ✗ zstd compression error: {e}")
+            if tar_zst_path.exists():
+                tar_zst_path.unlink()
+    else:
+        print("    zstandard not installed (pip install zstandard) — skipping")
+    
     print(f"\n  Archive creation complete!")
 
 
@@ -511,6 +1011,7 @@ def summary():
     dist_folder = DIST_DIR / APP_NAME
     zip_path = DIST_DIR / f"{APP_NAME}-v{VERSION}-windows-x64.zip"
     sevenz_path = DIST_DIR / f"{APP_NAME}-v{VERSION}-windows-x64.7z"
+    tar_zst_path = DIST_DIR / f"{APP_NAME}-v{VERSION}-windows-x64.tar.zst"
     
     print("  Output files:")
     print(f"    Executable: dist/{APP_NAME}/{APP_NAME}.exe")
@@ -523,18 +1024,23 @@ def summary():
         size_mb = sevenz_path.stat().st_size / (1024 * 1024)
         print(f"    7Z Archive: {sevenz_path.name} ({size_mb:.1f} MB)")
     
+    if tar_zst_path.exists():
+        size_mb = tar_zst_path.stat().st_size / (1024 * 1024)
+        print(f"    TAR.ZST Archive: {tar_zst_path.name} ({size_mb:.1f} MB)")
+    
     print("\n  Upload to GitHub Release:")
     print(f"    1. Primary: {zip_path.name} (everyone can open)")
     if sevenz_path.exists():
         print(f"    2. Optional: {sevenz_path.name} (smaller, requires 7-Zip)")
+    if tar_zst_path.exists():
+        print(f"    3. Recommended for fast download: {tar_zst_path.name} "
+              "(smallest, fastest to extract; 7-Zip 23+ or tar on Windows 11)")
     
     print("\n  Build complete!")
 
 
-def verify_build() -> bool:
-    """Verify the build output."""
-    print_step(7, 8, "Verifying build")
-
+def check_components():
+    """Check the distribution for each required component: [(name, path, present)]."""
     dist_folder = DIST_DIR / APP_NAME
     exe_path = dist_folder / f"{APP_NAME}.exe"
 
@@ -547,10 +1053,23 @@ def verify_build() -> bool:
         (dist_folder / "licenses", "Licenses"),
         (dist_folder / "README.txt", "README"),
     ]
+    return [(name, path, path.exists()) for path, name in checks]
+
+
+def verify_build(components=None) -> bool:
+    """Verify the build output.
+
+    `components` is a check_components() result computed earlier (main()
+    runs it alongside create_archives()); it is computed here if omitted.
+    """
+    print_step(7, 8, "Verifying build")
+
+    if components is None:
+        components = check_components()
 
     all_ok = True
-    for path, name in checks:
-        if path.exists():
+    for name, path, present in components:
+        if present:
             print(f"  ✓ {name}: {path}")
         else:
             print(f"  ✗ {name}: MISSING at {path}")
@@ -564,8 +1083,28 @@ def verify_build() -> bool:
     return all_ok
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=f"Build the {APP_NAME} Windows release.")
+    parser.add_argument(
+        "--full", "--clean",
+        dest="full",
+        action="store_true",
+        help="wipe build/ and PyInstaller's cache for a from-scratch build "
+             "(default: incremental, reusing the cache)",
+    )
+    parser.add_argument(
+        "--link",
+        action="store_true",
+        help="hard-link compilers/ into dist/ instead of copying (same volume only; "
+             "falls back to copying per file)",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main build process."""
+    args = parse_args()
+    
     print(f"\n{'='*70}")
     print(f"Building {APP_NAME} v{VERSION} for Windows")
     print(f"{'='*70}\n")
@@ -573,16 +1112,29 @@ def main():
     os.chdir(ROOT_DIR)
     
     try:
-        clean_build()
-        run_pyinstaller()
-        copy_resources()
+        digest = input_digest(args.link)
+        if not args.full and is_up_to_date(digest):
+            print(f"  Inputs unchanged since the last build ({digest[:12]}) — nothing to do.")
+            print("  Use --full to force a rebuild.")
+            return
+        
+        clean_build(args.full)
+        run_pyinstaller(args.full)
+        copy_resources(args.link)
         create_readme()
         # Optional: sign the built executable if SIGN_PFX and SIGN_PFX_PASSWORD are set
         sign_executable()
-        create_archives()
-        verify_build()
+        # The checks only stat() dist/, so they run on a worker while the
+        # archives compress; the report is printed after, keeping the output in order
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            components = pool.submit(check_components)
+            create_archives()
+        verify_build(components.result())
         summary()
         
+        # Recorded last, so an interrupted build is never treated as current
+        MANIFEST_PATH.write_text(digest + "\n", encoding='utf-8')
+        
         print(f"\n{'='*70}")
         print("SUCCESS!")
         print(f"{'='*70}\n")